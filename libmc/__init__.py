@@ -5,24 +5,38 @@ __email__   = "florian.schroegendorfer@phlo.at"
 __license__ = "MIT"
 __version__ = "2017.4"
 
-from .traversal import bfs, dfs
+from .traversal import bfs, dfs, externalBfs, parallelBfs
 from .bdd import BDD
 from .boole import Boole
-from .fa import FA
-from .lts import LTS, asynchronousComposition, maximumSimulation, maximumBisimulation
+from .fa import CompactFA, FA
+from .lts import CompactLTS, LTS, asynchronousComposition, asynchronousCompositionStream, branchingBisimulation, distributedComposition, maximumSimulation, maximumBisimulation
+from .partition import hopcroft, paigeTarjan
+from .simulation import hhk
+from .symbolic import symbolicComposition
 from .tarjan import tarjan
 
 __all__ = [
     "asynchronousComposition",
+    "asynchronousCompositionStream",
     "BDD",
+    "branchingBisimulation",
+    "CompactFA",
+    "CompactLTS",
     "Boole",
     "bfs",
     "dfs",
+    "distributedComposition",
+    "externalBfs",
     "FA",
+    "hhk",
+    "hopcroft",
     "LTS",
     "maximumSimulation",
     "maximumBisimulation",
+    "paigeTarjan",
+    "parallelBfs",
+    "symbolicComposition",
     "tarjan"
 ]
 
-del bdd, boole, fa, lts, printing, traversal
+del bdd, boole, fa, lts, partition, printing, simulation, symbolic, traversal, utils
@@ -1,11 +1,783 @@
+from array import array
 from weakref import WeakValueDictionary
 
+class ComputedTable:
+    """
+    Bounded, direct-mapped operation cache (computed table).
+
+    Results of operations on BDD nodes (handles) are stored in a fixed number
+    of slots, selected by hashing the operation and its operands. A new entry
+    simply replaces the slot's previous entry (lossy). The table is cleared
+    whenever unreferenced nodes are garbage collected.
+
+    Args:
+        size (int - optional): number of slots (power of 2)
+
+    Attributes:
+        hits (int): number of successful lookups
+        misses (int): number of failed lookups
+    """
+    # operations whose operands can be swapped
+    commutative = { bool.__and__, bool.__or__, bool.__xor__ }
+
+    def __init__ (self, size=1 << 18):
+        if size < 1 or size & (size - 1):
+            raise ValueError("size must be a power of 2")
+
+        self.size = size
+        self.clear()
+
+    def __len__ (self):
+        return sum(entry is not None for entry in self.table)
+
+    def clear (self):
+        """Removes all entries and resets the counters."""
+        self.table = [ None ] * self.size
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate (self):
+        """Removes all entries (keeping the counters)."""
+        self.table = [ None ] * self.size
+
+    def key (self, op, a, b):
+        """Returns the normalized key of an operation (and its slot)."""
+        if op in ComputedTable.commutative and b < a:
+            a, b = b, a
+
+        return (op, a, b), hash((op, a, b)) & (self.size - 1)
+
+    def lookup (self, op, a, b):
+        """Returns the cached result of ``op(a, b)`` or ``None``."""
+        key, slot = self.key(op, a, b)
+        entry = self.table[slot]
+
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        return None
+
+    def insert (self, op, a, b, result):
+        """Caches the result of ``op(a, b)``."""
+        key, slot = self.key(op, a, b)
+        self.table[slot] = (key, result)
+
+class BDDManager:
+    """
+    Array based BDD node manager.
+
+    Nodes are stored in parallel arrays (level, else and then successor) and
+    referred to by integer handles: the node's index shifted left by one,
+    with the lowest bit marking a complemented edge. Node 0 is the constant,
+    i.e. handle 0 is ``False`` and handle 1 is ``True``.
+
+    Levels are mapped to variable indices by the variable order (higher
+    levels are nearer to the root), initially every variable is at the level
+    of its index. The order can be changed in place by swapping adjacent
+    levels, which keeps the handles of all nodes (i.e. all :class:`BDD`
+    objects) valid, either explicitly or automatically (sifting or window
+    permutation) whenever the number of nodes doubled.
+
+    Nodes are kept canonical by an open addressing unique table and by
+    storing else successors uncomplemented. Nodes referenced by live
+    :class:`BDD` objects are counted, all others are freed by a mark and
+    sweep garbage collection, run between operations once the number of
+    nodes exceeds a threshold (doubled if less than half is freed).
+
+    Args:
+        threshold (int - optional): number of nodes triggering garbage
+            collection
+
+    Attributes:
+        level (array): level per node (-1: constant, -2: free)
+        low (array): else successor (handle) per node
+        high (array): then successor (handle) per node
+        ref (array): number of referencing :class:`BDD` objects per node
+        order (list(int)): variable index per level
+        position (list(int)): level per variable index
+        reordering (string): method of automatic reordering (``None``:
+            disabled)
+        limit (int): number of nodes triggering automatic reordering
+    """
+    # level of free nodes
+    FREE = -2
+
+    # maximum growth of the number of nodes while sifting a variable
+    GROWTH = 1.2
+
+    def __init__ (self, threshold=1 << 16):
+        self.level = array('i', [ -1 ])
+        self.low = array('q', [ 0 ])
+        self.high = array('q', [ 0 ])
+        self.ref = array('i', [ 0 ])
+        self.free = []
+        self.table = array('q', [ 0 ]) * 1024
+        self.nodes = 1
+        self.threshold = threshold
+        self.computed = ComputedTable()
+        self.handles = WeakValueDictionary()
+        self.order = []
+        self.position = []
+        self.reordering = None
+        self.limit = 1 << 12
+
+    def __len__ (self):
+        return self.nodes
+
+    def variable (self, idx):
+        """Returns the level of a variable (placed on top if it is new)."""
+        while idx >= len(self.order):
+            self.position.append(len(self.order))
+            self.order.append(len(self.order))
+
+        return self.position[idx]
+
+    def __slot__ (self, v, lo, hi):
+        # unique table slot of node (v, lo, hi) or the empty slot to insert it
+        mask = len(self.table) - 1
+        i = hash((v, lo, hi)) & mask
+        while True:
+            n = self.table[i]
+            if not n or (self.level[n] == v and self.low[n] == lo and self.high[n] == hi):
+                return i
+            i = (i + 1) & mask
+
+    def __rehash__ (self, size):
+        self.table = array('q', [ 0 ]) * size
+        for n in range(1, len(self.level)):
+            if self.level[n] != BDDManager.FREE:
+                self.table[self.__slot__(self.level[n], self.low[n], self.high[n])] = n
+
+    def __allocate__ (self, v, lo, hi):
+        # new node (v, lo, hi), reusing a free one if possible
+        if self.free:
+            n = self.free.pop()
+            self.level[n] = v
+            self.low[n] = lo
+            self.high[n] = hi
+            self.ref[n] = 0
+        else:
+            n = len(self.level)
+            self.level.append(v)
+            self.low.append(lo)
+            self.high.append(hi)
+            self.ref.append(0)
+
+        self.nodes += 1
+
+        return n
+
+    def node (self, v, lo, hi):
+        """
+        Returns the handle of the node (v, lo, hi), i.e. *if v then hi else
+        lo*.
+
+        Args:
+            v (int): level (greater than those of lo and hi)
+            lo (int): else successor (handle)
+            hi (int): then successor (handle)
+
+        Returns:
+            int: handle
+        """
+        if lo == hi:
+            return lo
+
+        # else successors are stored uncomplemented
+        sign = lo & 1
+        lo ^= sign
+        hi ^= sign
+
+        i = self.__slot__(v, lo, hi)
+        n = self.table[i]
+
+        if not n:
+            n = self.__allocate__(v, lo, hi)
+            self.table[i] = n
+
+            # rehash at load factor 1/2
+            if 2 * self.nodes > len(self.table):
+                self.__rehash__(2 * len(self.table))
+
+        return n << 1 | sign
+
+    def cofactors (self, f, v):
+        """Returns the else and then cofactors of handle f for level v."""
+        n = f >> 1
+        if self.level[n] != v:
+            return f, f
+
+        sign = f & 1
+        return self.low[n] ^ sign, self.high[n] ^ sign
+
+    def apply (self, op, f, g):
+        """
+        Applies a binary boolean operation to two handles.
+
+        Args:
+            op (function): boolean operation ``f: bool, bool -> bool``
+            f (int): handle
+            g (int): handle
+
+        Returns:
+            int: handle of ``op(f, g)``
+        """
+        # terminal cases
+        if f < 2 and g < 2:
+            return 1 if op(bool(f), bool(g)) else 0
+
+        if op is bool.__and__:
+            if f == 0 or g == 0 or f == g ^ 1: return 0
+            if f == 1: return g
+            if g == 1 or f == g: return f
+        elif op is bool.__or__:
+            if f == 1 or g == 1 or f == g ^ 1: return 1
+            if f == 0: return g
+            if g == 0 or f == g: return f
+        elif op is bool.__xor__:
+            if f == g: return 0
+            if f == g ^ 1: return 1
+            if f < 2: return g ^ f
+            if g < 2: return f ^ g
+
+            # ¬f ^ g = ¬(f ^ g)
+            sign = (f ^ g) & 1
+            if sign or f & 1:
+                return self.apply(op, f & ~1, g & ~1) ^ sign
+
+        res = self.computed.lookup(op, f, g)
+        if res is not None:
+            return res
+
+        v = max(self.level[f >> 1], self.level[g >> 1])
+        f0, f1 = self.cofactors(f, v)
+        g0, g1 = self.cofactors(g, v)
+
+        res = self.node(v, self.apply(op, f0, g0), self.apply(op, f1, g1))
+
+        self.computed.insert(op, f, g, res)
+
+        return res
+
+    def ite (self, f, g, h):
+        """Returns the handle of *if f then g else h*."""
+        return self.apply(
+            bool.__or__,
+            self.apply(bool.__and__, f, g),
+            self.apply(bool.__and__, f ^ 1, h)
+        )
+
+    def exists (self, f, levels):
+        """
+        Existential quantification.
+
+        Args:
+            f (int): handle
+            levels (frozenset(int)): levels of the variables to quantify
+
+        Returns:
+            int: handle of *∃ variables: f*
+        """
+        if not levels:
+            return f
+
+        bottom = min(levels)
+
+        def exists (f):
+            if f < 2:
+                return f
+
+            v = self.level[f >> 1]
+
+            # no quantified variable below v
+            if v < bottom:
+                return f
+
+            res = self.computed.lookup("exists", f, levels)
+            if res is not None:
+                return res
+
+            f0, f1 = self.cofactors(f, v)
+            res = exists(f0)
+
+            if v in levels:
+                if res != 1:
+                    res = self.apply(bool.__or__, res, exists(f1))
+            else:
+                res = self.node(v, res, exists(f1))
+
+            self.computed.insert("exists", f, levels, res)
+
+            return res
+
+        return exists(f)
+
+    def forall (self, f, levels):
+        """Universal quantification, i.e. *∀ variables: f = ¬∃ variables: ¬f*."""
+        return self.exists(f ^ 1, levels) ^ 1
+
+    def andExists (self, f, g, levels):
+        """
+        Relational product, i.e. *∃ variables: f ∧ g*, without building the
+        conjunction.
+
+        Args:
+            f (int): handle
+            g (int): handle
+            levels (frozenset(int)): levels of the variables to quantify
+
+        Returns:
+            int: handle of *∃ variables: f ∧ g*
+        """
+        if not levels:
+            return self.apply(bool.__and__, f, g)
+
+        bottom = min(levels)
+
+        def andExists (f, g):
+            # terminal cases
+            if f == 0 or g == 0 or f == g ^ 1:
+                return 0
+            if f == 1 or f == g:
+                return self.exists(g, levels)
+            if g == 1:
+                return self.exists(f, levels)
+
+            v = max(self.level[f >> 1], self.level[g >> 1])
+
+            # no quantified variable below v
+            if v < bottom:
+                return self.apply(bool.__and__, f, g)
+
+            # the conjunction is commutative
+            if g < f:
+                f, g = g, f
+
+            res = self.computed.lookup("andExists", (f, g), levels)
+            if res is not None:
+                return res
+
+            f0, f1 = self.cofactors(f, v)
+            g0, g1 = self.cofactors(g, v)
+            res = andExists(f0, g0)
+
+            if v in levels:
+                if res != 1:
+                    res = self.apply(bool.__or__, res, andExists(f1, g1))
+            else:
+                res = self.node(v, res, andExists(f1, g1))
+
+            self.computed.insert("andExists", (f, g), levels, res)
+
+            return res
+
+        return andExists(f, g)
+
+    def restrict (self, f, assignment):
+        """
+        Cofactor with respect to a (partial) assignment.
+
+        Args:
+            f (int): handle
+            assignment (frozenset(tuple(int, bool))): pairs of level and
+                value
+
+        Returns:
+            int: handle of f with the assigned variables replaced by constants
+        """
+        if f < 2 or not assignment:
+            return f
+
+        values = dict(assignment)
+        bottom = min(values)
+
+        def restrict (f):
+            if f < 2:
+                return f
+
+            v = self.level[f >> 1]
+            if v < bottom:
+                return f
+
+            res = self.computed.lookup("restrict", f, assignment)
+            if res is not None:
+                return res
+
+            f0, f1 = self.cofactors(f, v)
+
+            if v in values:
+                res = restrict(f1 if values[v] else f0)
+            else:
+                res = self.node(v, restrict(f0), restrict(f1))
+
+            self.computed.insert("restrict", f, assignment, res)
+
+            return res
+
+        return restrict(f)
+
+    def compose (self, f, v, g):
+        """Returns the handle of f with the variable at level v replaced by g."""
+        return self.ite(
+            g,
+            self.restrict(f, frozenset({ (v, True) })),
+            self.restrict(f, frozenset({ (v, False) }))
+        )
+
+    def rename (self, f, mapping):
+        """
+        Variable renaming (substitution of variables by variables).
+
+        Args:
+            f (int): handle
+            mapping (frozenset(tuple(int, int))): pairs of old and new level
+                (injective)
+
+        Returns:
+            int: handle of f with the variables renamed
+        """
+        if f < 2 or not mapping:
+            return f
+
+        variables = dict(mapping)
+        bottom = min(variables)
+
+        def rename (f):
+            if f < 2:
+                return f
+
+            v = self.level[f >> 1]
+            if v < bottom:
+                return f
+
+            res = self.computed.lookup("rename", f, mapping)
+            if res is not None:
+                return res
+
+            f0, f1 = self.cofactors(f, v)
+            f0 = rename(f0)
+            f1 = rename(f1)
+            w = variables.get(v, v)
+
+            # new variable is still above its successors
+            if w > self.level[f0 >> 1] and w > self.level[f1 >> 1]:
+                res = self.node(w, f0, f1)
+            else:
+                res = self.ite(self.node(w, 0, 1), f1, f0)
+
+            self.computed.insert("rename", f, mapping, res)
+
+            return res
+
+        return rename(f)
+
+    def collect (self):
+        """
+        Frees all nodes not reachable from a referenced node (mark and
+        sweep).
+
+        Returns:
+            int: number of freed nodes
+        """
+        # mark
+        marked = bytearray(len(self.level))
+        marked[0] = 1
+        stack = [ n for n in range(1, len(self.level)) if self.ref[n] > 0 ]
+        while stack:
+            n = stack.pop()
+            if marked[n]:
+                continue
+            marked[n] = 1
+            stack.append(self.low[n] >> 1)
+            stack.append(self.high[n] >> 1)
+
+        # sweep
+        freed = 0
+        for n in range(1, len(self.level)):
+            if not marked[n] and self.level[n] != BDDManager.FREE:
+                self.level[n] = BDDManager.FREE
+                self.free.append(n)
+                freed += 1
+
+        self.nodes -= freed
+        self.__rehash__(len(self.table))
+        self.computed.invalidate()
+
+        return freed
+
+    def maybeCollect (self):
+        """
+        Runs the garbage collection and the automatic reordering if their
+        thresholds are exceeded.
+        """
+        if self.nodes >= self.threshold:
+            self.collect()
+            if 2 * self.nodes > self.threshold:
+                self.threshold *= 2
+
+        if self.reordering is not None and self.nodes >= self.limit:
+            self.reorder(self.reordering)
+            self.limit = max(self.limit, 2 * self.nodes)
+
+    def reorder (self, method="sifting"):
+        """
+        Reorders the variables to reduce the number of nodes.
+
+        Args:
+            method (string - optional): ``"sifting"`` (Rudell's sifting) or
+                ``"window"`` (window permutation of 3 adjacent levels)
+
+        Returns:
+            int: number of nodes
+        """
+        if method not in ("sifting", "window"):
+            raise ValueError("unknown reordering method: {}".format(method))
+
+        reordering = _Reordering(self)
+
+        if method == "sifting":
+            reordering.sift()
+        else:
+            reordering.window()
+
+        reordering.finish()
+
+        return self.nodes
+
+    def setOrder (self, order):
+        """
+        Moves the variables to the given levels, e.g. to restore an order
+        found by :meth:`reorder`.
+
+        Args:
+            order (list(int)): variable index per level (starting with the
+                bottom level), missing variables are kept on top
+
+        Returns:
+            int: number of nodes
+        """
+        if len(set(order)) != len(order) or min(order, default=0) < 0:
+            raise ValueError("order is not a permutation of variables")
+
+        self.variable(max(order, default=-1))
+        order = list(order) + [ v for v in self.order if v not in set(order) ]
+
+        reordering = _Reordering(self)
+        for l, v in enumerate(order):
+            reordering.move(v, l)
+        reordering.finish()
+
+        return self.nodes
+
+    def bdd (self, f):
+        """Returns the :class:`BDD` object of a given handle."""
+        bdd = self.handles.get(f)
+        if bdd is None:
+            bdd = object.__new__(BDD)
+            bdd.manager = self
+            bdd.handle = f
+            self.ref[f >> 1] += 1
+            self.handles[f] = bdd
+
+        return bdd
+
+class _Reordering:
+    """
+    In place variable reordering of a :class:`BDDManager`.
+
+    Unreferenced nodes are collected first. While reordering, the nodes of
+    every level are kept in a separate unique table and count all their
+    references (nodes and :class:`BDD` objects), so that nodes orphaned by a
+    swap are freed at once and the number of nodes is exact.
+    """
+    def __init__ (self, manager):
+        manager.collect()
+
+        self.manager = manager
+        self.tables = [ {} for l in manager.order ]
+        self.refs = array('i', manager.ref)
+
+        for n in range(1, len(manager.level)):
+            if manager.level[n] != BDDManager.FREE:
+                lo, hi = manager.low[n], manager.high[n]
+                self.tables[manager.level[n]][(lo, hi)] = n
+                self.refs[lo >> 1] += 1
+                self.refs[hi >> 1] += 1
+
+    def node (self, l, lo, hi):
+        # handle of node (l, lo, hi), created if necessary
+        if lo == hi:
+            return lo
+
+        sign = lo & 1
+        lo ^= sign
+        hi ^= sign
+
+        n = self.tables[l].get((lo, hi))
+        if n is None:
+            n = self.manager.__allocate__(l, lo, hi)
+            if n < len(self.refs):
+                self.refs[n] = 0
+            else:
+                self.refs.append(0)
+
+            self.tables[l][(lo, hi)] = n
+            self.refs[lo >> 1] += 1
+            self.refs[hi >> 1] += 1
+
+        return n << 1 | sign
+
+    def release (self, n):
+        # removes a reference to node n, freeing unreferenced nodes
+        manager = self.manager
+        stack = [ n ]
+        while stack:
+            n = stack.pop()
+            if not n:
+                continue
+
+            self.refs[n] -= 1
+            if self.refs[n]:
+                continue
+
+            del self.tables[manager.level[n]][(manager.low[n], manager.high[n])]
+            manager.level[n] = BDDManager.FREE
+            manager.free.append(n)
+            manager.nodes -= 1
+
+            stack.append(manager.low[n] >> 1)
+            stack.append(manager.high[n] >> 1)
+
+    def swap (self, l):
+        """Swaps the variables at levels l and l + 1."""
+        manager = self.manager
+        upper, lower = self.tables[l + 1], self.tables[l]
+
+        # nodes of the lower variable move up
+        for n in lower.values():
+            manager.level[n] = l + 1
+
+        self.tables[l + 1] = lower
+        self.tables[l] = {}
+
+        # nodes of the upper variable not depending on the lower one move down
+        dependent = []
+        for (f0, f1), n in upper.items():
+            if manager.level[f0 >> 1] == l + 1 or manager.level[f1 >> 1] == l + 1:
+                dependent.append(n)
+            else:
+                manager.level[n] = l
+                self.tables[l][(f0, f1)] = n
+
+        # the others become nodes of the lower variable (keeping their handle)
+        for n in dependent:
+            f0, f1 = manager.low[n], manager.high[n]
+            f00, f01 = manager.cofactors(f0, l + 1)
+            f10, f11 = manager.cofactors(f1, l + 1)
+
+            g0 = self.node(l, f00, f10)
+            g1 = self.node(l, f01, f11)
+            manager.low[n] = g0
+            manager.high[n] = g1
+            self.tables[l + 1][(g0, g1)] = n
+            self.refs[g0 >> 1] += 1
+            self.refs[g1 >> 1] += 1
+
+            self.release(f0 >> 1)
+            self.release(f1 >> 1)
+
+        x, y = manager.order[l + 1], manager.order[l]
+        manager.order[l], manager.order[l + 1] = x, y
+        manager.position[x], manager.position[y] = l, l + 1
+
+    def move (self, v, l):
+        """Moves variable v to level l."""
+        position = self.manager.position
+        while position[v] < l:
+            self.swap(position[v])
+        while position[v] > l:
+            self.swap(position[v] - 1)
+
+    def sift (self):
+        """
+        Rudell's sifting: every variable (most nodes first) is moved through
+        all levels, nearest end first, and placed on the level with the
+        fewest nodes. A direction is abandoned once the number of nodes
+        exceeds the best one by the factor ``BDDManager.GROWTH``.
+        """
+        manager = self.manager
+        top = len(manager.order) - 1
+
+        variables = sorted(
+            range(len(manager.order)),
+            key=lambda v: -len(self.tables[manager.position[v]])
+        )
+
+        for v in variables:
+            l = manager.position[v]
+            best, level = manager.nodes, l
+
+            for step in ((-1, 1) if 2 * l < top else (1, -1)):
+                while 0 <= l + step <= top and \
+                        manager.nodes <= BDDManager.GROWTH * best:
+                    self.swap(min(l, l + step))
+                    l += step
+                    if manager.nodes < best:
+                        best, level = manager.nodes, l
+
+            self.move(v, level)
+
+    def window (self):
+        """
+        Window permutation: all permutations of 3 adjacent levels are tried,
+        bottom up, until the number of nodes does not decrease anymore.
+        """
+        manager = self.manager
+
+        # swaps (relative to the window) visiting all permutations
+        swaps = (0, 1, 0, 1, 0)
+
+        improved = True
+        while improved:
+            improved = False
+            for l in range(len(manager.order) - 2):
+                nodes = [ manager.nodes ]
+                for i in swaps:
+                    self.swap(l + i)
+                    nodes.append(manager.nodes)
+
+                # undo the swaps following the best permutation
+                best = nodes.index(min(nodes))
+                for i in reversed(swaps[best:]):
+                    self.swap(l + i)
+
+                improved = improved or best > 0
+
+    def finish (self):
+        """Rebuilds the unique table of the manager."""
+        manager = self.manager
+
+        size = len(manager.table)
+        while 2 * manager.nodes > size:
+            size *= 2
+
+        manager.__rehash__(size)
+        manager.computed.invalidate()
+
 class BDD:
     """
     Binary Decision Diagram (p149).
 
+    A :class:`BDD` is a handle to a node of a :class:`BDDManager` (by default
+    the one shared by all BDDs), i.e. ``BDD(idx, sign, child)`` represents *if
+    x_idx then child[1] else child[0]*, complemented if **sign** is set.
+    Equal functions are represented by the same object (while referenced).
+
     Attributes:
-        idx (int): node index
+        idx (int): node index (the variable index, -1 for constants)
+        level (int): the node's level in the current variable order
         sign (bool): the node's sign
         child (list(BDD, BDD)): the node's *else* and *then* successors
 
@@ -13,106 +785,87 @@ class BDD:
         Operations are carried out using the logical connectives ``~``, ``|``,
         ``&`` and ``^``.
     """
-    __unique__ = WeakValueDictionary()
-
-    __id__ = lambda idx, sign, child: \
-        hash((idx, sign, id(child[0]), id(child[1]))) \
-        if child is not None else \
-            1 if sign else 0
-
-    def __hash__ (self):
-        return BDD.__id__(self.idx, self.sign, self.child)
+    __manager__ = BDDManager()
 
     def __new__ (BDD, *args):
-        def new_bdd (idx, sign, child):
-            node = BDD.__id__(idx, sign, child)
-            if node not in BDD.__unique__:
-                bdd = object.__new__(BDD)
-                bdd.idx = idx
-                bdd.sign = sign
-                bdd.child = child
-                BDD.__unique__[node] = bdd
-
-            return BDD.__unique__[node]
+        manager = BDD.__manager__
 
         idx = args[0]
         sign = args[1] if len(args) > 1 else False
-        child = \
-            None if idx < 0 \
-            else \
-                args[2] if len(args) > 2 and args[2] is not None \
-                else [ BDD.false(), BDD.true() ]
 
-        if child is not None:
-            if child[0] == child[1]:
-                return child[0]
+        if idx < 0:
+            f = 0
+        elif len(args) > 2 and args[2] is not None:
+            child = args[2]
+            f = manager.node(
+                manager.variable(idx),
+                child[0].handle,
+                child[1].handle
+            )
+        else:
+            f = manager.node(manager.variable(idx), 0, 1)
 
-            if BDD.__id__(idx, not sign, child) not in BDD.__unique__:
-                sign = child[0].sign
-                if sign:
-                    child[0] = ~child[0]
-                    child[1] = ~child[1]
+        return manager.bdd(f ^ 1 if sign else f)
 
-        return new_bdd(idx, sign, child)
+    def __del__ (self):
+        try:
+            self.manager.ref[self.handle >> 1] -= 1
+        except Exception:
+            pass
 
-    def __repr__ (self):
+    @property
+    def idx (self):
         if self.isConstant():
-            return "BDD({}, {})".format(self.idx, self.sign)
-        else:
-            return "BDD({}, {}, {})".format(self.idx, self.sign, self.child)
+            return -1
 
-    @classmethod
-    def __top_idx__ (BDD, *args):
-        return max(bdd.idx for bdd in args)
+        return self.manager.order[self.level]
 
-    def __cofactor__ (self, pos, idx):
-        if self.isConstant():
-            return self
+    @property
+    def level (self):
+        return self.manager.level[self.handle >> 1]
 
-        sign = self.sign
-        if sign:
-            self = ~self
+    @property
+    def sign (self):
+        return bool(self.handle & 1)
 
-        res = self.child[pos] if self.idx == idx else self
+    @property
+    def child (self):
+        if self.isConstant():
+            return None
 
-        return ~res if sign else res
+        n = self.handle >> 1
+        return [
+            self.manager.bdd(self.manager.low[n]),
+            self.manager.bdd(self.manager.high[n])
+        ]
 
-    @classmethod
-    def __cofactor2__ (BDD, a, b):
-        idx = BDD.__top_idx__(a, b)
+    def __hash__ (self):
+        return self.handle
 
-        c = [
-                [ a.__cofactor__(0, idx), a.__cofactor__(1, idx) ],
-                [ b.__cofactor__(0, idx), b.__cofactor__(1, idx) ]
-            ]
+    def __repr__ (self):
+        if self.isConstant():
+            return "BDD({}, {})".format(self.idx, self.sign)
+        else:
+            return "BDD({}, {}, {})".format(self.idx, self.sign, self.child)
 
-        return (idx, c)
+    def __cofactor__ (self, pos, idx):
+        manager = self.manager
+        return manager.bdd(manager.cofactors(
+            self.handle,
+            manager.variable(idx)
+        )[pos])
 
     @classmethod
     def __apply__ (BDD, op, a, b):
-        if a.isConstant() and b.isConstant():
-            return BDD.true() if op(bool(a), bool(b)) else BDD.false()
-
-        idx, c = BDD.__cofactor2__(a, b)
-        bdd = BDD(
-            idx,
-            False,
-            [
-                BDD.__apply__(op, c[0][0], c[1][0]),
-                BDD.__apply__(op, c[0][1], c[1][1])
-            ]
-        )
-
-        return bdd
+        manager = BDD.__manager__
+        manager.maybeCollect()
+        return manager.bdd(manager.apply(op, a.handle, b.handle))
 
     def __bool__ (self):
         return self.sign
 
     def __invert__ (self):
-        if self.isConstant():
-            return BDD.false() if self else BDD.true()
-
-        return BDD(self.idx, not self.sign, self.child)
+        return self.manager.bdd(self.handle ^ 1)
 
     def __and__ (self, other):
         return BDD.__apply__(bool.__and__, self, other)
@@ -123,33 +876,197 @@ class BDD:
     def __xor__ (self, other):
         return BDD.__apply__(bool.__xor__, self, other)
 
+    def exists (self, variables):
+        """
+        Existential quantification.
+
+        Args:
+            variables (iterable(int)): variable indices to quantify
+
+        Returns:
+            BDD: *∃ variables: self*
+        """
+        manager = self.manager
+        manager.maybeCollect()
+        return manager.bdd(manager.exists(
+            self.handle,
+            frozenset(manager.variable(v) for v in variables)
+        ))
+
+    def forall (self, variables):
+        """
+        Universal quantification.
+
+        Args:
+            variables (iterable(int)): variable indices to quantify
+
+        Returns:
+            BDD: *∀ variables: self*
+        """
+        manager = self.manager
+        manager.maybeCollect()
+        return manager.bdd(manager.forall(
+            self.handle,
+            frozenset(manager.variable(v) for v in variables)
+        ))
+
+    def andExists (self, other, variables):
+        """
+        Relational product (e.g. the image of a set of states under a
+        transition relation), computed in a single pass without building the
+        conjunction of both BDDs.
+
+        Args:
+            other (BDD): the second operand
+            variables (iterable(int)): variable indices to quantify
+
+        Returns:
+            BDD: *∃ variables: self ∧ other*
+        """
+        manager = self.manager
+        manager.maybeCollect()
+        return manager.bdd(manager.andExists(
+            self.handle,
+            other.handle,
+            frozenset(manager.variable(v) for v in variables)
+        ))
+
+    def restrict (self, assignment):
+        """
+        Cofactor with respect to a (partial) assignment.
+
+        Args:
+            assignment (dict): map of variable indices to bool
+
+        Returns:
+            BDD: self with the assigned variables replaced by constants
+        """
+        manager = self.manager
+        manager.maybeCollect()
+        return manager.bdd(manager.restrict(
+            self.handle,
+            frozenset(
+                (manager.variable(v), bool(value))
+                for v, value in assignment.items()
+            )
+        ))
+
+    def compose (self, idx, other):
+        """
+        Functional composition.
+
+        Args:
+            idx (int): variable index
+            other (BDD): the substituted function
+
+        Returns:
+            BDD: self with the variable idx replaced by other
+        """
+        manager = self.manager
+        manager.maybeCollect()
+        return manager.bdd(manager.compose(
+            self.handle,
+            manager.variable(idx),
+            other.handle
+        ))
+
+    def rename (self, mapping):
+        """
+        Variable renaming, e.g. from current to next state variables.
+
+        Args:
+            mapping (dict): injective map of old to new variable indices
+
+        Returns:
+            BDD: self with the variables renamed
+        """
+        manager = self.manager
+        manager.maybeCollect()
+        return manager.bdd(manager.rename(
+            self.handle,
+            frozenset(
+                (manager.variable(v), manager.variable(w))
+                for v, w in mapping.items()
+            )
+        ))
+
     def __eq__ (self, other):
-        return hash(self) == hash(other)
+        return isinstance(other, BDD) and \
+            self.manager is other.manager and \
+            self.handle == other.handle
 
     def __neq__ (self, other):
         return not self == other
 
-    __true__ = None
-
     @classmethod
     def true (BDD):
         """Boolean constant ``True``."""
-        if BDD.__true__ is None:
-            BDD.__true__ = BDD(-1, True)
-        return BDD.__true__
-
-    __false__ = None
+        return BDD.__manager__.bdd(1)
 
     @classmethod
     def false (BDD):
         """Boolean constant ``False``."""
-        if BDD.__false__ is None:
-            BDD.__false__ = BDD(-1, False)
-        return BDD.__false__
+        return BDD.__manager__.bdd(0)
+
+    @classmethod
+    def computedTable (BDD):
+        """Returns the operation cache shared by all operations."""
+        return BDD.__manager__.computed
+
+    @classmethod
+    def reorder (BDD, method="sifting"):
+        """
+        Reorders the variables of all BDDs to reduce the number of nodes
+        (see :meth:`BDDManager.reorder`).
+
+        Args:
+            method (string - optional): ``"sifting"`` or ``"window"``
+
+        Returns:
+            int: number of nodes
+        """
+        return BDD.__manager__.reorder(method)
+
+    @classmethod
+    def dynamicReordering (BDD, method="sifting"):
+        """
+        Enables automatic reordering whenever the number of nodes doubled.
+
+        Args:
+            method (string - optional): ``"sifting"``, ``"window"`` or
+                ``None`` to disable automatic reordering
+        """
+        if method not in (None, "sifting", "window"):
+            raise ValueError("unknown reordering method: {}".format(method))
+
+        BDD.__manager__.reordering = method
+
+    @classmethod
+    def order (BDD):
+        """
+        Returns the variable order, e.g. to restore it using
+        :meth:`setOrder`.
+
+        Returns:
+            list(int): variable index per level (starting with the bottom
+            level)
+        """
+        return list(BDD.__manager__.order)
+
+    @classmethod
+    def setOrder (BDD, order):
+        """
+        Sets the variable order (of all BDDs).
+
+        Args:
+            order (list(int)): variable index per level (starting with the
+                bottom level)
+        """
+        BDD.__manager__.setOrder(order)
 
     def isConstant (self):
         """Returns ``True`` for constant nodes."""
-        return self.idx < 0
+        return self.handle < 2
 
     def toDot (self):
         """
@@ -161,7 +1078,8 @@ class BDD:
         """
         declared = set()
 
-        def declare (bdd, node):
+        def declare (bdd):
+            node = bdd.handle
             if node in declared:
                 return ""
 
@@ -178,20 +1096,20 @@ class BDD:
 
         def bdd2dot (bdd):
             edge = "\t\"{}\" -- \"{}\" {}\n"
-            node = hash(bdd)
-            dot = declare(bdd, node)
+            dot = declare(bdd)
             if bdd.isConstant():
                 return dot
 
             for child in bdd.child:
-                childNode = hash(child)
-                dot += declare(child, childNode)
+                visited = child.handle in declared
+                dot += declare(child)
                 dot += edge.format(
-                    node,
-                    childNode,
+                    bdd.handle,
+                    child.handle,
                     "" if child == bdd.child[1] else "[style=dashed,color=red]"
                 )
-                dot += bdd2dot(child)
+                if not visited:
+                    dot += bdd2dot(child)
 
             return dot
 
@@ -228,16 +228,142 @@ class Boole:
             product([False, True], repeat=len(self.variables))
         ]
 
-    def toBDD (self):
+    def _appearance (self):
+        # variables in order of their first appearance (depth first)
+        order = []
+        seen = set()
+        stack = [ self.formula ]
+        while stack:
+            expr = stack.pop()
+            if isinstance(expr, Boole.Var):
+                if expr.args[0] not in seen:
+                    seen.add(expr.args[0])
+                    order.append(expr.args[0])
+            else:
+                stack.extend(reversed(expr.args))
+
+        return order
+
+    def _fanin (self):
+        # variables by decreasing weight, propagated from the root and split
+        # evenly among the operands of every operator
+        weight = { v: 0 for v in self.variables }
+        stack = [ (self.formula, 1) ]
+        while stack:
+            expr, w = stack.pop()
+            if isinstance(expr, Boole.Var):
+                weight[expr.args[0]] += w
+            else:
+                for arg in expr.args:
+                    stack.append((arg, w / len(expr.args)))
+
+        return sorted(self._appearance(), key=lambda v: -weight[v])
+
+    def _force (self):
+        # hyperedges: variables of every subformula
+        edges = set()
+
+        def support (expr):
+            if isinstance(expr, Boole.Var):
+                return frozenset(expr.args)
+
+            variables = frozenset().union(*(support(arg) for arg in expr.args))
+            if len(variables) > 1:
+                edges.add(variables)
+
+            return variables
+
+        support(self.formula)
+        edges = list(edges)
+
+        order = self._appearance()
+        position = { v: i for i, v in enumerate(order) }
+
+        def span ():
+            return sum(
+                max(position[v] for v in e) - min(position[v] for v in e)
+                for e in edges
+            )
+
+        best = (span(), order)
+
+        # move variables to the center of gravity of their hyperedges until
+        # the total span does not decrease anymore
+        while True:
+            gravity = {}
+            for e in edges:
+                center = sum(position[v] for v in e) / len(e)
+                for v in e:
+                    gravity.setdefault(v, []).append(center)
+
+            order = sorted(
+                order,
+                key=lambda v: sum(gravity[v]) / len(gravity[v])
+                    if v in gravity else position[v]
+            )
+            position = { v: i for i, v in enumerate(order) }
+
+            if span() >= best[0]:
+                return best[1]
+
+            best = (span(), order)
+
+    def order (self, heuristic="dfs"):
+        """
+        Computes a static variable order for :meth:`toBDD`.
+
+        Heuristics:
+            * ``"sorted"``: sorted variable names
+            * ``"dfs"``: order of appearance in the formula (depth first), i.e.
+              related variables are kept close to each other
+            * ``"force"``: FORCE - variables are repeatedly moved to the
+              center of gravity of the subformulae they appear in, minimizing
+              the total span of all subformulae
+            * ``"fanin"``: variables with the largest weight (propagated from
+              the root and split evenly among the operands of every operator)
+              are placed nearest to the root
+
+        Args:
+            heuristic (string - optional): the ordering heuristic
+
+        Returns:
+            list: variable names by BDD index (the last one nearest to the
+            root)
+        """
+        if heuristic == "sorted":
+            return list(self.variables)
+        elif heuristic == "dfs":
+            order = self._appearance()
+        elif heuristic == "force":
+            order = self._force()
+        elif heuristic == "fanin":
+            order = self._fanin()
+        else:
+            raise ValueError("unknown ordering heuristic: {}".format(heuristic))
+
+        # top down to BDD indices
+        return order[::-1]
+
+    def toBDD (self, order=None):
         """
         Converts the formula to a BDD.
 
+        Args:
+            order (list or string - optional): variable names by BDD index
+                (the last one nearest to the root) or an ordering heuristic
+                (see :meth:`order`), default: sorted variable names
+
         Returns:
             BDD: BDD representing the formula
         """
-        return self.formula.toBDD({
-            self.variables[i]: BDD(i) for i in range(len(self.variables))
-        })
+        if order is None:
+            order = self.variables
+        elif isinstance(order, str):
+            order = self.order(order)
+        elif sorted(order) != self.variables:
+            raise ValueError("order must contain every variable exactly once")
+
+        return self.formula.toBDD({ v: BDD(i) for i, v in enumerate(order) })
 
     def toAIG (self):
         """
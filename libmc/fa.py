@@ -1,7 +1,10 @@
-from itertools import product
+from itertools import chain
 
-from .lts import LTS, maximumBisimulation
-from .printing import fa2dot
+from .lts import CompactLTS, LTS
+from .partition import hopcroft, paigeTarjan
+from .printing import fa2dot, fa2tex
+from .traversal import bfs
+from .utils import hashable
 
 def intersect (l1, l2):
     """Returns the intersection of two lists."""
@@ -11,6 +14,9 @@ class FA (LTS):
     """
     Finite Automaton (p18).
 
+    As for ``S``, ``I`` and ``T``, call :meth:`modified` after modifying
+    ``F`` in place.
+
     Attributes:
         S: set of states
         I: set of initial states I ⊆ S
@@ -21,6 +27,16 @@ class FA (LTS):
     def __init__ (self, S, I, Σ, T, F):
         super(FA, self).__init__(S, I, Σ, T)
         self.F = F
+        self._bits = None
+
+    @property
+    def F (self):
+        return self._F
+
+    @F.setter
+    def F (self, F):
+        self._F = F
+        self.modified()
 
     def __repr__ (self):
         return "FA(" + \
@@ -84,7 +100,8 @@ class FA (LTS):
                 only reachable states are included (default)
         """
         lts = super(FA, self).power(full)
-        F = [ s for s in lts.S if intersect(self.F, s) ]
+        final = { hashable(f) for f in self.F }
+        F = [ s for s in lts.S if any(hashable(x) in final for x in s) ]
 
         return FA(lts.S, lts.I, lts.Σ, lts.T, F)
 
@@ -98,6 +115,36 @@ class FA (LTS):
 
         return FA(S, I, Σ, T, F)
 
+    def _simulator (self):
+        """
+        Returns the bitset encoding used for simulating the automaton.
+
+        States are mapped to bit positions, the set of active states is
+        represented by an integer and successor masks are precomputed per
+        symbol (until the automaton is modified).
+        """
+        if self._bits is None or self._bits[0] != self._version:
+            bit = { hashable(s): 1 << i for i, s in enumerate(self.S) }
+
+            # successor masks per symbol and state
+            post = {}
+            for (s, a, t) in self.T:
+                masks = post.setdefault(a, {})
+                masks[bit[hashable(s)]] = \
+                    masks.get(bit[hashable(s)], 0) | bit[hashable(t)]
+
+            initial = 0
+            for s in self.I:
+                initial |= bit[hashable(s)]
+
+            final = 0
+            for s in self.F:
+                final |= bit[hashable(s)]
+
+            self._bits = (self._version, initial, final, post)
+
+        return self._bits[1:]
+
     def accepts (self, word):
         """
         Test acceptance of a given word.
@@ -108,19 +155,47 @@ class FA (LTS):
         Returns:
             bool: True if the word is accepted by the automaton
         """
-        def _accepts (state, word):
-            if not word:
-                return True if state in self.F else False
-            else:
-                return any(
-                    _accepts(_s, word[1:])
-                    for (s, a, _s) in self.T
-                    if s == state and a == word[0]
-                )
+        return self.acceptsMany([ word ])[0]
+
+    def acceptsMany (self, words):
+        """
+        Test acceptance of multiple words.
+
+        All words share the precomputed successor masks and the steps
+        (mask, symbol) -> mask computed during this call.
 
-        return any(_accepts(i, word) for i in self.I)
+        Args:
+            words (iterable): the words to check
 
-    def conforms (self, other, full=False):
+        Returns:
+            list: acceptance (bool) of each word
+        """
+        initial, final, post = self._simulator()
+        steps = {}
+
+        def step (current, a):
+            masks = post.get(a, {})
+            successors = 0
+            while current:
+                low = current & -current
+                successors |= masks.get(low, 0)
+                current ^= low
+            return successors
+
+        def accepts (word):
+            current = initial
+            for a in word:
+                successors = steps.get((current, a))
+                if successors is None:
+                    successors = steps[(current, a)] = step(current, a)
+                current = successors
+                if not current:
+                    return False
+            return bool(current & final)
+
+        return [ accepts(word) for word in words ]
+
+    def conforms (self, other, full=False, antichain=False):
         """
         Conformance test (p24).
 
@@ -128,58 +203,184 @@ class FA (LTS):
         * L(self) ∩ L(other) = 0
         * self × C(P(other)) contains no reachable final state (implemented)
 
+        If **antichain** is set, self × P(other) is explored on-the-fly in
+        breadth-first order, pruning states (s, X) subsumed by an already
+        visited state (s, Y) with Y ⊆ X, and the search stops at the first
+        (shortest) counterexample instead of building the checker automaton.
+
         Args:
             other (FA): the other FA to conform to
             full (bool - optional): create full automaton if True, else
                 only reachable states are included (default)
+            antichain (bool - optional): use the antichain based inclusion
+                check (default: False)
 
         Returns:
             (bool, FA, list): a triple containing:
 
             * the result of the conformance test
-            * the generated checker automaton self × C(P(other))
-            * all traces from initial to final states
+            * the generated checker automaton self × C(P(other)) (None if
+              **antichain** is set)
+            * all traces from initial to final states (a single shortest
+              trace if **antichain** is set)
         """
+        if antichain:
+            trace = self._antichain(other)
+            return (trace is None, None, [] if trace is None else [ trace ])
+
         A = self.product(other.power(full).complement(), full);
 
-        traces = [ t for f in A.F for t in A.trace(f) if t ]
+        # the empty trace, if an initial state is final (ε is a counterexample)
+        traces = [ [] for f in A.F if f in A.I ][:1] + \
+            [ t for f in A.F for t in A.trace(f) ]
 
         return (not traces, A, traces)
 
-    def minimize (self):
-        """Minimization of Deterministic Finite Automata (p44)."""
-        notFinal = set(self.S) - set(self.F)
-
-        bisimulation = {
-            (a, b)
-            for (a, b) in
-                maximumBisimulation(
-                    self,
-                    self,
-                    set(product(self.F, self.F)) | \
-                    set(product(notFinal, notFinal))
+    def _antichain (self, other):
+        """
+        Antichain based language inclusion check L(self) ⊆ L(other).
+
+        Returns:
+            list: shortest trace through self × C(P(other)) to a final state
+            or None if the inclusion holds
+        """
+        final = { hashable(f) for f in self.F }
+        otherFinal = { hashable(f) for f in other.F }
+
+        # map state keys to states of the other automaton
+        states = { hashable(s): s for s in chain(other.S, other.I) }
+
+        # successor keys per state and symbol of the other automaton
+        post = {}
+
+        def successors (s, a):
+            if (s, a) not in post:
+                post[(s, a)] = frozenset(
+                    hashable(t) for t in other.successors(s, a)
                 )
-            if self.S.index(a) < self.S.index(b)
-        }
+            return post[(s, a)]
+
+        # minimal macro states visited per state of self
+        antichain = {}
+
+        def cache (node):
+            s, X = node[0], node[1]
+            antichain[hashable(s)] = [
+                Y for Y in antichain.get(hashable(s), []) if not X <= Y
+            ] + [ X ]
+
+        def cached (node):
+            s, X = node[0], node[1]
+            return any(Y <= X for Y in antichain.get(hashable(s), []))
 
-        redundantStates = { b for (a, b) in bisimulation }
+        # search nodes: (state, macro state, parent node, transition)
+        I = frozenset(hashable(s) for s in other.I)
+        queue = [ (s, I, None, None) for s in self.I ]
 
-        S = [
-                tuple([s] + [ b for (a, b) in bisimulation if a == s ])
-                for s in self.S if s not in redundantStates
+        for node in queue:
+            cache(node)
+
+        def expand (node):
+            s, X = node[0], node[1]
+            for t in self.outgoing(s):
+                Y = frozenset().union(*(successors(x, t[1]) for x in X))
+                yield (t[2], Y, node, t[1])
+
+        # final state of self reached with no final state of other
+        counterexample = None
+
+        def quit (node):
+            nonlocal counterexample
+            if hashable(node[0]) in final and otherFinal.isdisjoint(node[1]):
+                counterexample = node
+                return True
+            return False
+
+        bfs(queue, expand, cache=cache, cached=cached, quit=quit)
+
+        if counterexample is None:
+            return None
+
+        # reconstruct trace through the checker automaton self × C(P(other))
+        def toState (node):
+            return (node[0], sorted(states[x] for x in node[1]))
+
+        trace = []
+        node = counterexample
+        while node[2] is not None:
+            trace.append((toState(node[2]), node[3], toState(node)))
+            node = node[2]
+
+        return trace[::-1]
+
+    def minimize (self):
+        """
+        Minimization of Deterministic Finite Automata (p44).
+
+        Equivalent states are merged using Hopcroft's algorithm (or the
+        Paige-Tarjan algorithm in case of a nondeterministic automaton).
+        """
+        final = { hashable(f) for f in self.F }
+
+        P0 = [
+                [ s for s in self.S if hashable(s) in final ],
+                [ s for s in self.S if hashable(s) not in final ]
             ]
-        I = [ s for s in S if any(i in s for i in self.I) ]
+
+        Σ = { a: i for i, a in enumerate(self.Σ) }
+        T = [ t for t in self.T if t[1] in Σ ]
+
+        refine = hopcroft if self.isDeterministic() else paigeTarjan
+
+        S = [ tuple(b) for b in refine(self.S, T, [ b for b in P0 if b ]) ]
+
+        # map states to their block's index
+        block = { hashable(s): i for i in range(len(S)) for s in S[i] }
+
+        def blocks (states):
+            return [ S[i] for i in sorted({ block[hashable(s)] for s in states }) ]
+
+        I = blocks(self.I)
         T = [
-                (s, a, t)
-                for s in S
-                for t in S
-                for a in self.Σ
-                if any(
-                    (_s, a, _t) in self.T
-                    for _s in s if _s not in redundantStates
-                    for _t in t if _t
+                (S[i], a, S[j])
+                for (i, j, k, a) in sorted(
+                    {
+                        (block[hashable(s)], block[hashable(t)], Σ[a], a)
+                        for (s, a, t) in T
+                    },
+                    key=lambda t: t[:3]
                 )
             ]
-        F = [ s for s in S if any(f in s for f in self.F) ]
+        F = blocks(self.F)
 
         return FA(S, I, self.Σ, T, F)
+
+    def compact (self):
+        """
+        Returns a compact representation of the FA (see :class:`CompactFA`).
+        """
+        return CompactFA(self)
+
+class CompactFA (CompactLTS, FA):
+    """
+    Compact Finite Automaton.
+
+    A :class:`~libmc.lts.CompactLTS` with a set of (interned) final states,
+    i.e. all automata algorithms operate on it directly. Use :meth:`expand`
+    to convert it back.
+
+    Args:
+        fa (FA): the FA to compact
+    """
+    def __init__ (self, fa):
+        super(CompactFA, self).__init__(fa)
+
+        ids = { hashable(s): i for i, s in enumerate(self.states) }
+        self.F = sorted(ids[hashable(f)] for f in fa.F)
+        self._bits = None
+
+    def expand (self):
+        """
+        Returns the FA over the original states and labels.
+        """
+        return FA(*self._expand(), [ self.states[f] for f in self.F ])
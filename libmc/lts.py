@@ -1,8 +1,19 @@
-from functools import reduce
+from array import array
+from bisect import bisect_left, bisect_right
 from itertools import chain, combinations, product
-
+from queue import Empty
+import multiprocessing
+import os
+import pickle
+import traceback
+import zlib
+
+from .partition import paigeTarjan
 from .printing import fa2dot, fa2tex
-from .traversal import dfs
+from .simulation import hhk
+from .tarjan import tarjan
+from .traversal import dfs, visitedSet
+from .utils import hashable
 
 def powerset (s):
     """Returns the powerset of s."""
@@ -18,18 +29,61 @@ class LTS:
     """
     Labelled Transition System (p31).
 
+    Derived data (e.g. the adjacency index) is dropped whenever ``S``, ``I``
+    or ``T`` are reassigned. After modifying them in place, call
+    :meth:`modified`.
+
     Attributes:
         S: set of states
         I: set of initial states I ⊆ S
         Σ: input alphabet
         T: transition relation T ⊆ SxΣxS
     """
+    # number of modifications (of S, I, T and derived attributes)
+    _version = 0
+
     def __init__ (self, S, I, Σ, T):
+        self._index = None
         self.S = S
         self.I = I
         self.Σ = Σ
         self.T = T
 
+    def modified (self):
+        """
+        Invalidates all derived data (e.g. the adjacency index). Must be
+        called after modifying ``S``, ``I`` or ``T`` in place.
+        """
+        self._index = None
+        self._version += 1
+
+    @property
+    def S (self):
+        return self._S
+
+    @S.setter
+    def S (self, S):
+        self._S = S
+        self.modified()
+
+    @property
+    def I (self):
+        return self._I
+
+    @I.setter
+    def I (self, I):
+        self._I = I
+        self.modified()
+
+    @property
+    def T (self):
+        return self._T
+
+    @T.setter
+    def T (self, T):
+        self._T = T
+        self.modified()
+
     def __repr__ (self):
         return "LTS(" + \
             str(self.S) + ", " + \
@@ -68,51 +122,140 @@ class LTS:
         """
         return fa2tex(self.S, self.I, self.Σ, self.T, [], highlight)
 
+    def _getIndex (self):
+        """
+        Returns the adjacency index (outgoing, successors, predecessors).
+
+        The index is built lazily on first use and rebuilt after ``S``, ``I``
+        or ``T`` have been reassigned or :meth:`modified` has been called.
+        """
+        if self._index is None:
+            outgoing = {}
+            successors = {}
+            predecessors = {}
+
+            for t in self._T:
+                s = hashable(t[0])
+                _s = hashable(t[2])
+                outgoing.setdefault(s, []).append(t)
+                successors.setdefault(s, {}).setdefault(t[1], []).append(t[2])
+                predecessors.setdefault(_s, {}).setdefault(t[1], []).append(t[0])
+
+            self._index = (len(self._T), outgoing, successors, predecessors)
+
+        return self._index
+
+    def outgoing (self, s):
+        """
+        Returns all transitions leaving a given state (in order of ``T``).
+
+        Args:
+            s: source state
+
+        Returns:
+            list: transitions (s, a, s') ∊ T
+        """
+        return list(self._getIndex()[1].get(hashable(s), []))
+
+    def successors (self, s, a=None):
+        """
+        Returns the successors of a given state.
+
+        Args:
+            s: source state
+            a (optional): only consider transitions labelled with **a**
+
+        Returns:
+            list: { s' ∊ S | s -a> s' }
+        """
+        successors = self._getIndex()[2].get(hashable(s), {})
+
+        # states reachable under several labels are only listed once
+        if a is None:
+            return list({
+                hashable(_s): _s for l in successors.values() for _s in l
+            }.values())
+
+        return list(successors.get(a, []))
+
+    def predecessors (self, s, a=None):
+        """
+        Returns the predecessors of a given state.
+
+        Args:
+            s: target state
+            a (optional): only consider transitions labelled with **a**
+
+        Returns:
+            list: { s' ∊ S | s' -a> s }
+        """
+        predecessors = self._getIndex()[3].get(hashable(s), {})
+
+        # states reachable under several labels are only listed once
+        if a is None:
+            return list({
+                hashable(_s): _s for l in predecessors.values() for _s in l
+            }.values())
+
+        return list(predecessors.get(a, []))
+
     def isComplete (self):
         """Completeness (p21): True if LTS is complete."""
-        return len(self.I) > 0 and \
-            reduce(lambda x, y: x and y,
-                map(lambda x: len(x) > 0,
-                    [
-                        [ t for t in self.T if t[0] == s and t[1] == a ]
-                        for s in self.S
-                        for a in self.Σ
-                    ]
-                )
-            )
+        return len(self.I) > 0 and all(
+            self.successors(s, a)
+            for s in self.S
+            for a in self.Σ
+        )
 
     def isDeterministic (self):
         """Determinism (p21): True if LTS is deterministic."""
-        return len(self.I) <= 1 and \
-            reduce(lambda x, y: x and y,
-                map(lambda x: len(x) <= 1,
-                    [
-                        [ t for t in self.T if t[0] == s and t[1] == a ]
-                        for s in self.S
-                        for a in self.Σ
-                    ]
-                )
-            )
+        return len(self.I) <= 1 and all(
+            len(self.successors(s, a)) <= 1
+            for s in self.S
+            for a in self.Σ
+        )
 
     @classmethod
     def _generateReachable (cls, initial, transitions):
+        """
+        Generates all states and transitions reachable from **initial**.
+
+        Args:
+            initial (list): set of initial states
+            transitions (function): ``f: state -> list(transition)`` returning
+                all transitions leaving a given state
+
+        Returns:
+            (list, list): sorted lists of reachable states and transitions
+        """
         S = []
         T = []
 
+        # hashable keys of visited states and generated transitions
+        visited = set()
+        generated = set()
+
         stack = list(initial)
 
-        def cache (succ): S.append(succ)
+        def cache (succ):
+            visited.add(hashable(succ))
+            S.append(succ)
 
-        def cached (succ): return succ in S
+        def cached (succ): return hashable(succ) in visited
 
         def successors (cur):
-            for t in filter(lambda t: t[0] == cur and t not in T, transitions):
-                T.append(t)
-                yield t[2]
+            for t in transitions(cur):
+                key = (hashable(t[0]), t[1], hashable(t[2]))
+                if key not in generated:
+                    generated.add(key)
+                    T.append(t)
+                    yield t[2]
 
         dfs(stack, successors, cache=cache, cached=cached)
 
-        S.extend(s for s in initial if s not in S)
+        for s in initial:
+            if not cached(s):
+                cache(s)
 
         return (sorted(S), sorted(T))
 
@@ -125,18 +268,21 @@ class LTS:
             full (bool - optional): create full automaton if True, else
                 only reachable states are included (default)
         """
-        S = sorted(product(self.S, other.S))
         I = sorted(product(self.I, other.I))
-        T = [
+
+        def transitions (s):
+            return [
                 (s, a, (t1, t2))
-                for s in S
                 for a in self.Σ
-                for (s1, a1, t1) in self.T if s1 == s[0] and a1 == a
-                for (s2, a2, t2) in other.T if s2 == s[1] and a2 == a
+                for t1 in self.successors(s[0], a)
+                for t2 in other.successors(s[1], a)
             ]
 
-        if not full:
-            S, T = self._generateReachable(I, T)
+        if full:
+            S = sorted(product(self.S, other.S))
+            T = [ t for s in S for t in transitions(s) ]
+        else:
+            S, T = self._generateReachable(I, transitions)
 
         return LTS(S, I, self.Σ, T)
 
@@ -148,20 +294,55 @@ class LTS:
             full (bool - optional): create full automaton if True, else
                 only reachable states are included (default)
         """
-        S = powerset(self.S)
-        I = [ self.I ]
-        T = [
-                (s1, a, sorted(s2))
-                for s1 in S
-                for a in self.Σ
-                for s2 in
-                [{ t for (s, _a, t) in self.T if s in s1 and _a == a }]
-            ]
+        if full:
+            S = powerset(self.S)
+            I = [ self.I ]
+            T = [
+                    (s1, a, sorted(s2))
+                    for s1 in S
+                    for a in self.Σ
+                    for s2 in
+                    [{ t for s in s1 for t in self.successors(s, a) }]
+                ]
+
+            return LTS(S, I, self.Σ, T)
+
+        # map state keys to states
+        states = { hashable(s): s for s in chain(self.S, self.I) }
+
+        # successor keys per state and symbol
+        post = {}
+
+        def successors (s, a):
+            if (s, a) not in post:
+                post[(s, a)] = frozenset(
+                    hashable(t) for t in self.successors(s, a)
+                )
+            return post[(s, a)]
 
-        if not full:
-            S, T = self._generateReachable(I, T)
+        # macro states (sets of state keys) mapped to sorted lists of states
+        initial = frozenset(hashable(s) for s in self.I)
+        macro = { initial: sorted(states[s] for s in initial) }
 
-        return LTS(S, I, self.Σ, T)
+        T = []
+
+        # on-the-fly subset construction
+        def expand (X):
+            for a in self.Σ:
+                Y = frozenset().union(*(successors(s, a) for s in X))
+                if Y not in macro:
+                    macro[Y] = sorted(states[s] for s in Y)
+
+                T.append((macro[X], a, macro[Y]))
+
+                yield Y
+
+        dfs([ initial ], expand)
+
+        S = sorted(macro.values())
+        I = [ macro[initial] ]
+
+        return LTS(S, I, self.Σ, sorted(T))
 
     def simulates (self, other, τ=[]):
         """
@@ -177,12 +358,10 @@ class LTS:
             bool: True if this LTS simulates the other
         """
         R0 = set(product(other.S, self.S))
+        R = maximumSimulation(other, self, R0, τ)
 
         return all(
-            any(
-                (s1, s2) in maximumSimulation(other, self, R0, τ)
-                for s2 in self.I
-            )
+            any((s1, s2) in R for s2 in self.I)
             for s1 in other.I
         )
 
@@ -199,16 +378,91 @@ class LTS:
         Returns:
             bool: True if this LTS bisimulates the other
         """
-        R0 = set(product(other.S, self.S))
+        if τ:
+            return self.saturate(τ).bisimulates(other.saturate(τ))
+
+        # map each state of the disjoint union to its bisimulation class
+        S, T = _disjointUnion(other, self)
+        block = {
+            hashable(s): i
+            for i, B in enumerate(paigeTarjan(S, T))
+            for s in B
+        }
 
         return all(
-            any(
-                (s1, s2) in maximumBisimulation(other, self, R0, τ)
-                for s2 in self.I
-            )
+            any(block[hashable((0, s1))] == block[hashable((1, s2))]
+                for s2 in self.I)
             for s1 in other.I
         )
 
+    def saturate (self, τ):
+        """
+        Weak transition relation.
+
+        Creates an LTS containing a transition s -a> s' for every s ⇒a s',
+        i.e. a path of the form τ*a from s to s' with a ∉ τ. The τ-closure
+        of each state is computed only once per strongly connected component
+        of the τ-subgraph.
+
+        Args:
+            τ: set of unobservable internal events
+
+        Returns:
+            LTS: LTS over Σ \\ τ containing the weak transitions
+        """
+        τ = set(τ)
+
+        # condensation of the τ-subgraph
+        components = tarjan(
+            [ hashable(s) for s in self.S ],
+            { (hashable(t[0]), hashable(t[2])) for t in self.T if t[1] in τ }
+        )
+
+        component = { s: c for c in range(len(components)) for s in components[c] }
+
+        # τ-successors and visible successors of each component
+        internal = [ set() for c in components ]
+        visible = [ {} for c in components ]
+
+        for (s, a, t) in self.T:
+            c = component[hashable(s)]
+            if a in τ:
+                if component[hashable(t)] != c:
+                    internal[c].add(component[hashable(t)])
+            else:
+                visible[c].setdefault(a, {})[hashable(t)] = t
+
+        # weak successors (τ*a) of each component in reverse topological order
+        weak = [ None ] * len(components)
+
+        for root in range(len(components)):
+            stack = [ root ]
+            while stack:
+                c = stack[-1]
+                if weak[c] is not None:
+                    stack.pop()
+                    continue
+
+                pending = [ _c for _c in internal[c] if weak[_c] is None ]
+                if pending:
+                    stack.extend(pending)
+                    continue
+
+                stack.pop()
+                weak[c] = { a: dict(succ) for a, succ in visible[c].items() }
+                for _c in internal[c]:
+                    for a, succ in weak[_c].items():
+                        weak[c].setdefault(a, {}).update(succ)
+
+        T = [
+                (s, a, t)
+                for s in self.S
+                for a, succ in weak[component[hashable(s)]].items()
+                for t in succ.values()
+            ]
+
+        return LTS(self.S, self.I, [ a for a in self.Σ if a not in τ ], T)
+
     def trace (self, target, sources=None):
         """
         Tries to compute all traces to the target state (DFS).
@@ -251,14 +505,226 @@ class LTS:
             nonlocal node, path, trace
             node, path, trace = current
             return [
-                t for t in self.T
-                if t[0] == node and t[2] not in path[1:]
+                t for t in self.outgoing(node)
+                if t[2] not in path[1:]
             ]
 
         dfs(stack, successors, enqueue=enqueue, cache=cache, cached=cached)
 
         return traces
 
+    def compact (self):
+        """
+        Returns a compact representation of the LTS (see :class:`CompactLTS`).
+        """
+        return CompactLTS(self)
+
+class _CompactTransitions:
+    """
+    Read-only sequence of the transitions (s, a, s') of a :class:`CompactLTS`.
+    """
+    def __init__ (self, lts):
+        self.lts = lts
+
+    def __len__ (self):
+        return len(self.lts.target)
+
+    def __iter__ (self):
+        offset = self.lts.offset
+        label = self.lts.label
+        target = self.lts.target
+        for s in range(len(offset) - 1):
+            for i in range(offset[s], offset[s + 1]):
+                yield (s, label[i], target[i])
+
+    def __getitem__ (self, i):
+        if isinstance(i, slice):
+            return [ self[j] for j in range(*i.indices(len(self))) ]
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("transition index out of range")
+
+        s = bisect_right(self.lts.offset, i) - 1
+        return (s, self.lts.label[i], self.lts.target[i])
+
+    def __eq__ (self, other):
+        return list(self) == list(other)
+
+    def __repr__ (self):
+        return repr(list(self))
+
+class CompactLTS (LTS):
+    """
+    Compact Labelled Transition System.
+
+    States and labels are interned to dense integers (in order of ``S`` and
+    ``Σ``) and transitions are stored in compressed sparse row (CSR) arrays,
+    sorted by source, label and target, i.e. 8 bytes per transition (plus 4
+    per state):
+
+    * the transitions leaving s are ``offset[s]`` to ``offset[s + 1] - 1``
+    * ``label[i]`` and ``target[i]`` are the label and target of transition i
+
+    A :class:`CompactLTS` is an :class:`LTS` over the interned states and
+    labels, i.e. all algorithms operate on it directly. Use :meth:`expand`
+    to convert it back.
+
+    Args:
+        lts (LTS): the LTS to compact
+
+    Attributes:
+        states: original states (indexed by interned state)
+        labels: original labels (indexed by interned label)
+        offset: CSR offsets ``array('I')``
+        label: CSR labels ``array('I')``
+        target: CSR targets ``array('I')``
+    """
+    def __init__ (self, lts):
+        self.states = list(lts.S)
+        self.labels = list(lts.Σ)
+
+        # intern states and labels (labels missing in Σ are appended)
+        ids = { hashable(s): i for i, s in enumerate(self.states) }
+        symbols = { hashable(a): i for i, a in enumerate(self.labels) }
+
+        for (s, a, t) in lts.T:
+            if hashable(a) not in symbols:
+                symbols[hashable(a)] = len(self.labels)
+                self.labels.append(a)
+
+        transitions = sorted(
+            (ids[hashable(s)], symbols[hashable(a)], ids[hashable(t)])
+            for (s, a, t) in lts.T
+        )
+
+        # build CSR arrays
+        self.offset = array('I', [ 0 ]) * (len(self.states) + 1)
+        self.label = array('I', (a for (s, a, t) in transitions))
+        self.target = array('I', (t for (s, a, t) in transitions))
+
+        for (s, a, t) in transitions:
+            self.offset[s + 1] += 1
+
+        for s in range(len(self.states)):
+            self.offset[s + 1] += self.offset[s]
+
+        self.I = [ ids[hashable(s)] for s in lts.I ]
+        self.Σ = list(range(len(lts.Σ)))
+
+        self._index = None
+        self._reverse = None
+
+    @property
+    def S (self):
+        return range(len(self.states))
+
+    @property
+    def T (self):
+        return _CompactTransitions(self)
+
+    def _getIndex (self):
+        """
+        Returns the adjacency index, i.e. the CSR arrays (which never change).
+        """
+        if self._index is None:
+            self._index = (len(self.target), self.offset, self.label, self.target)
+
+        return self._index
+
+    def _range (self, s, a):
+        # range of transitions leaving s (labelled with a)
+        lo = self.offset[s]
+        hi = self.offset[s + 1]
+
+        if a is None:
+            return lo, hi
+
+        return bisect_left(self.label, a, lo, hi), bisect_right(self.label, a, lo, hi)
+
+    def outgoing (self, s):
+        """
+        Returns all transitions leaving a given state (in order of ``T``).
+
+        Args:
+            s (int): source state
+
+        Returns:
+            list: transitions (s, a, s') ∊ T
+        """
+        lo, hi = self._range(s, None)
+        return [ (s, self.label[i], self.target[i]) for i in range(lo, hi) ]
+
+    def successors (self, s, a=None):
+        """
+        Returns the successors of a given state.
+
+        Args:
+            s (int): source state
+            a (int - optional): only consider transitions labelled with **a**
+
+        Returns:
+            list: { s' ∊ S | s -a> s' }
+        """
+        lo, hi = self._range(s, a)
+        return self.target[lo:hi].tolist()
+
+    def predecessors (self, s, a=None):
+        """
+        Returns the predecessors of a given state.
+
+        The reverse CSR arrays are built on first use.
+
+        Args:
+            s (int): target state
+            a (int - optional): only consider transitions labelled with **a**
+
+        Returns:
+            list: { s' ∊ S | s' -a> s }
+        """
+        if self._reverse is None:
+            transitions = sorted((_t, _a, _s) for (_s, _a, _t) in self.T)
+            offset = array('I', [ 0 ]) * len(self.offset)
+
+            for transition in transitions:
+                offset[transition[0] + 1] += 1
+
+            for i in range(len(self.states)):
+                offset[i + 1] += offset[i]
+
+            self._reverse = (
+                offset,
+                array('I', (t[1] for t in transitions)),
+                array('I', (t[2] for t in transitions))
+            )
+
+        offset, label, source = self._reverse
+        lo = offset[s]
+        hi = offset[s + 1]
+
+        if a is not None:
+            lo, hi = bisect_left(label, a, lo, hi), bisect_right(label, a, lo, hi)
+
+        return source[lo:hi].tolist()
+
+    def expand (self):
+        """
+        Returns the LTS over the original states and labels.
+        """
+        return LTS(*self._expand())
+
+    def _expand (self):
+        S = self.states
+        L = self.labels
+
+        return (
+            list(S),
+            [ S[s] for s in self.I ],
+            [ L[a] for a in self.Σ ],
+            [ (S[s], L[a], S[t]) for (s, a, t) in self.T ]
+        )
+
 def maximumSimulation (A1, A2, R0, τ=[]):
     """
     Constructs the maximum simulation relation A1 ≲ A2 (p36).
@@ -281,40 +747,19 @@ def maximumSimulation (A1, A2, R0, τ=[]):
     Returns:
         set: A1 ≲ A2 ⊆ R0 - the maximum simulation relation
     """
-    def isReachable (traces, a):
-        """Returns True if a trace of the form τ*a exists."""
-        return any(
-            all(t[1] in τ for t in trace[:-1]) and trace[-1][1] == a
-            for trace in traces
-        )
-
-    # refine simulation relation
-    R = {
-            (s, t)
-            for (s, t) in R0
-            # ∀ a ∈ Σ, s' ∈ S [ s -a> s' ]
-            if all(
-                # ∃ t' ∈ S [ t -a> t' ∧ s' ≲ t' ]
-                any(
-                    # s' ≲ t'
-                    (_s, _t) in R0
-                    # { t' ∈ S | t -a> t' }
-                    for _t in A2.S
-                    if isReachable(A2.trace(_t, [t]), a)
-                )
-                # { (a, s') ∈ ΣxS | s -a> s' }
-                for (a, _s) in
-                {
-                    (a, _s)
-                    for a in set(A1.Σ) - set(τ)
-                    for _s in A1.S
-                    if isReachable(A1.trace(_s, [s]), a)
-                }
-            )
-        }
-
-    # return relation if fixpoint is reached else recurs
-    return R if R == R0 else maximumSimulation(A1, A2, R, τ)
+    if τ:
+        A1 = A1.saturate(τ)
+        A2 = A2.saturate(τ)
+
+    Σ = set(A1.Σ)
+
+    return hhk(
+        A1.S,
+        [ t for t in A1.T if t[1] in Σ ],
+        A2.S,
+        [ t for t in A2.T if t[1] in Σ ],
+        R0
+    )
 
 def maximumBisimulation (A1, A2, R0, τ=[]):
     """
@@ -341,22 +786,401 @@ def maximumBisimulation (A1, A2, R0, τ=[]):
         τ (optional): set of unobservable internal events
 
     Returns:
-        set: A1 ≈ A2 ⊆ R0 - the maximum simulation relation
+        set: A1 ≈ A2 - the maximum bisimulation relation, as pairs (t, s)
+        of states t of A2 and s of A1 with (s, t) ∊ R0
+
+    Note:
+        Earlier versions computed the simulation of the maximum simulation
+        (i.e. mutual similarity), which may contain pairs of states that are
+        not bisimilar. The result is now the maximum bisimulation for any
+        starting relation R0.
+    """
+    if τ:
+        A1 = A1.saturate(τ)
+        A2 = A2.saturate(τ)
+
+    P0 = _rectangularPartition(A1, A2, R0)
+
+    # refine arbitrary starting relations directly
+    if P0 is None:
+        return { (t, s) for (s, t) in _refineBisimulation(A1, A2, R0) }
+
+    S, T = _disjointUnion(A1, A2)
+
+    # pairs are oriented like those of the simulation fixpoint (A2 x A1)
+    return {
+        (t, s)
+        for block in paigeTarjan(S, T, P0)
+        for (i, s) in block if i == 0
+        for (j, t) in block if j == 1
+    }
+
+def _refineBisimulation (A1, A2, R0):
+    """
+    Returns the largest bisimulation R ⊆ R0 between A1 and A2, i.e. pairs
+    (s, t) are removed until every transition of s is matched by one of t
+    (forth) and vice versa (back) with the targets related by R.
     """
-    return maximumSimulation(
-        A2,
-        A1,
-        { (s, t) for (t, s) in maximumSimulation(A1, A2, R0, τ) },
-        τ
+    # successors and predecessors per state and label
+    post1, pre1 = {}, {}
+    for (s, a, t) in A1.T:
+        post1.setdefault(hashable(s), {}).setdefault(a, []).append(hashable(t))
+        pre1.setdefault(hashable(t), {}).setdefault(a, []).append(hashable(s))
+
+    post2, pre2 = {}, {}
+    for (s, a, t) in A2.T:
+        post2.setdefault(hashable(s), {}).setdefault(a, []).append(hashable(t))
+        pre2.setdefault(hashable(t), {}).setdefault(a, []).append(hashable(s))
+
+    R = { (hashable(s), hashable(t)): (s, t) for (s, t) in R0 }
+
+    def matched (post, _post, s, t, forth):
+        # every transition of s is matched by a transition of t
+        return all(
+            any(
+                ((_s, _t) if forth else (_t, _s)) in R
+                for _t in _post.get(t, {}).get(a, [])
+            )
+            for a, targets in post.get(s, {}).items()
+            for _s in targets
+        )
+
+    # pairs to check
+    stack = list(R)
+
+    while stack:
+        s, t = stack.pop()
+        if (s, t) not in R:
+            continue
+
+        if matched(post1, post2, s, t, True) and \
+                matched(post2, post1, t, s, False):
+            continue
+
+        del R[(s, t)]
+
+        # recheck pairs of predecessors
+        for a, sources in pre1.get(s, {}).items():
+            for p in sources:
+                for q in pre2.get(t, {}).get(a, []):
+                    if (p, q) in R:
+                        stack.append((p, q))
+
+    return set(R.values())
+
+def _disjointUnion (A1, A2):
+    """Returns states and transitions of the disjoint union of A1 and A2."""
+    S = [ (0, s) for s in A1.S ] + [ (1, s) for s in A2.S ]
+    T = [ ((0, s), a, (0, t)) for (s, a, t) in A1.T ] + \
+        [ ((1, s), a, (1, t)) for (s, a, t) in A2.T ]
+
+    return (S, T)
+
+def _rectangularPartition (A1, A2, R0):
+    """
+    Returns the initial partition of the disjoint union of A1 and A2 induced
+    by a starting relation of the form R0 = ∪ Xi x Yi (with pairwise disjoint
+    Xi ⊆ A1.S and Yi ⊆ A2.S) or None if R0 is not of that form.
+    """
+    rows = {}
+    for (s, t) in R0:
+        rows.setdefault(s, set()).add(t)
+
+    # group states of A1 with identical rows
+    classes = {}
+    for s, row in rows.items():
+        classes.setdefault(frozenset(row), []).append(s)
+
+    # rows have to be pairwise disjoint
+    Y = set()
+    for row in classes:
+        if not Y.isdisjoint(row):
+            return None
+        Y |= row
+
+    X = set(rows)
+
+    return [
+            [ (0, s) for s in xs ] + [ (1, t) for t in row ]
+            for row, xs in classes.items()
+        ] + \
+        [ [ (0, s) for s in A1.S if s not in X ] ] + \
+        [ [ (1, t) for t in A2.S if t not in Y ] ]
+
+def branchingBisimulation (lts, τ, divergence=False):
+    """
+    Branching bisimulation reduction (Groote-Vaandrager).
+
+    Computes the branching bisimulation equivalence of a given LTS by
+    partition refinement in O(|S||T|) and returns the resulting quotient.
+
+    The O(|T| log |S|) algorithm of Groote, Jansen, Keiren and Wijs, needed
+    for LTS of about 10^6 transitions, is not implemented.
+
+    * states on a τ-cycle are collapsed in advance
+    * a block is split if only some of its states can reach an a-transition
+      into a splitter block by inert τ-steps (τ-steps within the block)
+    * in divergence sensitive mode, blocks containing a τ-cycle are kept
+      apart from blocks without one and get a τ-loop in the quotient
+
+    Args:
+        lts (LTS): the LTS to reduce
+        τ: set of unobservable internal events
+        divergence (bool - optional): preserve divergence (default: False)
+
+    Returns:
+        LTS: quotient LTS with states being tuples of branching bisimilar
+        states
+    """
+    τ = set(τ)
+
+    # collapse τ-cycles (strongly connected components of the τ-subgraph)
+    components = tarjan(
+        [ hashable(s) for s in lts.S ],
+        { (hashable(t[0]), hashable(t[2])) for t in lts.T if t[1] in τ }
     )
 
-def asynchronousComposition (*lts, partialOrderReduction=None):
+    component = { s: c for c in range(len(components)) for s in components[c] }
+
+    # incoming transitions (source, label) of each component, where internal
+    # events are represented by None
+    incoming = [ [] for c in components ]
+
+    # sources of incoming τ-transitions of each component
+    silent = [ [] for c in components ]
+
+    # targets of outgoing transitions of each component
+    targets = [ set() for c in components ]
+
+    # label of a τ-loop (if any) of each component
+    divergent = [ None ] * len(components)
+
+    for (s, a, t) in lts.T:
+        s = component[hashable(s)]
+        t = component[hashable(t)]
+
+        if a in τ:
+            if s == t:
+                divergent[s] = a
+                continue
+
+            silent[t].append(s)
+            incoming[t].append((s, None))
+        else:
+            incoming[t].append((s, a))
+
+        targets[s].add(t)
+
+    # divergence is treated as a loop labelled with a distinguished event δ
+    δ = object()
+
+    if divergence:
+        for c in range(len(components)):
+            if divergent[c] is not None:
+                incoming[c].append((c, δ))
+                targets[c].add(c)
+
+    # blocks (sets of components) and the block of each component
+    blocks = [ set(range(len(components))) ]
+    blockOf = [ 0 ] * len(components)
+
+    # splitter blocks to process
+    stack = [ 0 ]
+    pending = { 0 }
+
+    def push (block):
+        if block not in pending:
+            pending.add(block)
+            stack.append(block)
+
+    # split block B into pos and B \ pos
+    def split (B, pos):
+        new = len(blocks)
+        blocks.append(pos)
+        blocks[B] -= pos
+        for c in pos:
+            blockOf[c] = new
+
+        # both parts and all blocks B depends on have to be (re)checked
+        push(B)
+        push(new)
+        for c in blocks[B] | pos:
+            for t in targets[c]:
+                push(blockOf[t])
+
+    while stack:
+        X = stack.pop()
+        pending.remove(X)
+        splitter = set(blocks[X])
+
+        # sources of non-inert transitions into the splitter per label
+        marked = {}
+        for t in splitter:
+            for (s, a) in incoming[t]:
+                if a is None and s in splitter:
+                    continue
+                marked.setdefault(a, set()).add(s)
+
+        for a, sources in marked.items():
+            touched = {}
+            for s in sources:
+                touched.setdefault(blockOf[s], []).append(s)
+
+            for B, states in touched.items():
+
+                # states of B reaching an a-transition into X by inert τ-steps
+                pos = set(states)
+                while states:
+                    t = states.pop()
+                    for s in silent[t]:
+                        if blockOf[s] == B and s not in pos:
+                            pos.add(s)
+                            states.append(s)
+
+                if len(pos) < len(blocks[B]):
+                    split(B, pos)
+
+    # map blocks to quotient states (in order of S)
+    states = {}
+    for s in lts.S:
+        states.setdefault(blockOf[component[hashable(s)]], []).append(s)
+
+    Q = { b: tuple(B) for b, B in states.items() }
+    order = { b: i for i, b in enumerate(states) }
+
+    S = list(Q.values())
+    I = list(dict.fromkeys(
+        Q[blockOf[component[hashable(s)]]] for s in lts.I
+    ))
+
+    T = {}
+    for (s, a, t) in lts.T:
+        s = blockOf[component[hashable(s)]]
+        t = blockOf[component[hashable(t)]]
+        if a not in τ or s != t:
+            T[(s, a, t)] = None
+
+    if divergence:
+        for c in range(len(components)):
+            if divergent[c] is not None:
+                T[(blockOf[c], divergent[c], blockOf[c])] = None
+
+    T = [
+            (Q[s], a, Q[t])
+            for (s, a, t) in sorted(T, key=lambda t: (order[t[0]], order[t[2]]))
+        ]
+
+    return LTS(S, I, lts.Σ, T)
+
+class _Interleaving:
+    """
+    On-the-fly expansion of states of the asynchronous composition of a list
+    of LTS.
+    """
+    def __init__ (self, lts):
+        self.lts = lts
+        self.Σ = { a for l in lts for a in l.Σ }
+
+        # set of component indices
+        self.components = range(len(lts))
+
+        # local symbols
+        self.Λ = [
+                {
+                    a
+                    for a in l.Σ
+                    if all(a not in _l.Σ for _l in lts if _l is not l)
+                }
+                for l in lts
+            ]
+
+        # map of symbols to the set of components knowing that symbol
+        self.Ψ = {
+            a: { i for i in self.components if a in lts[i].Σ }
+            for a in self.Σ
+        }
+
+        # map of symbols to the bitmask of components knowing that symbol
+        self.bit = [ 1 << i for i in self.components ]
+        self.participants = {
+            a: sum(self.bit[i] for i in self.Ψ[a])
+            for a in self.Σ
+        }
+
+        # local successors per component: local state -> symbol -> targets
+        self.tables = [ {} for i in self.components ]
+        for i in self.components:
+            for (s, a, t) in lts[i].T:
+                self.tables[i].setdefault(s, {}).setdefault(a, []).append(t)
+
+    def localSuccessors (self, fromState):
+        """
+        Returns a dictionary containing successors per symbol and component
+        and the set of enabled symbols (known by all components having a
+        successor).
+        """
+        bit = self.bit
+        nextStates = {}
+        present = {}
+        for i, table in enumerate(self.tables):
+            for a, targets in table.get(fromState[i], {}).items():
+                nextStates.setdefault(a, {})[i] = targets
+                present[a] = present.get(a, 0) | bit[i]
+
+        participants = self.participants
+        enabled = { a for a in present if present[a] == participants[a] }
+
+        return nextStates, enabled
+
+    def toStates (self, fromState, nextStates, a):
+        """Generates all successors of a given symbol."""
+        moving = list(nextStates[a])
+        for targets in product(*nextStates[a].values()):
+            toState = list(fromState)
+            for i, t in zip(moving, targets):
+                toState[i] = t
+            yield tuple(toState)
+
+    def expansion (self, fromState, nextStates, symbols):
+        """Builds the expansion of the given (enabled) symbols."""
+        return [
+            (fromState, a, toState)
+            for a in sorted(symbols, reverse=True)
+            for toState in self.toStates(fromState, nextStates, a)
+        ]
+
+    def expand (self, fromState):
+        """Returns all transitions leaving a given state."""
+        nextStates, enabled = self.localSuccessors(fromState)
+        return self.expansion(fromState, nextStates, enabled)
+
+def asynchronousComposition (*lts, partialOrderReduction=None, reduction=None, visited="exact", sort=True):
     """
     Asynchronous composition of two or more LTS through interleaving (p84).
 
     * performs on-the-fly generation of reachable states
     * Partial Order Reduction can be applied by supplying a function
       **partialOrderReduction**, selecting the components to expand
+    * built-in Partial Order Reduction strategies can be selected with
+      **reduction**:
+
+      * ``"ample"``: expand the enabled transitions of a single component,
+        whose transitions (leaving its local state) are all local
+      * ``"persistent"``: expand the enabled transitions of a set of
+        components, closed under sharing a transition leaving their local
+        states (Overman's algorithm)
+      * ``"stubborn"``: expand the enabled transitions of a stubborn set of
+        labels (Valmari) - enabled labels add all labels leaving the local
+        states of their components (i.e. all dependent labels), disabled
+        labels add the labels leaving the local state of a component
+        disabling them (necessary enabling set)
+
+      Reductions are computed for every seed and the smallest is chosen. A
+      state is fully expanded if the reduced expansion closes a cycle on the
+      DFS stack (cycle proviso).
+
+    * the set of visited states can be replaced by a lossy but compact one
+      (hash compaction or bitstate hashing), trading completeness for memory
 
     Args:
         *lts (variable argument list(LTS)): list of LTS to interleave
@@ -364,27 +1188,92 @@ def asynchronousComposition (*lts, partialOrderReduction=None):
     Keyword Args:
         partialOrderReduction (optional): function ``f: list(index) ->
             list(index)`` selecting the local components to expand
+        reduction (str - optional): ``"ample"``, ``"persistent"`` or
+            ``"stubborn"``
+        visited (str or visited set - optional): set of visited states (see
+            :func:`~libmc.traversal.visitedSet`) - pass an instance to
+            inspect its ``omissionProbability()`` afterwards
+        sort (bool - optional): sort states and transitions (default: True)
     """
-    S = set(product(*[ l.I for l in lts ]))
-    I = sorted(S)
-    Σ = { a for l in lts for a in l.Σ }
+    S = []
     T = []
 
-    # set of component indices
-    components = range(len(lts))
-
-    # local symbols
-    Λ = [
-            {
-                a
-                for a in l.Σ
-                if all(a not in _l.Σ for _l in lts if _l is not l)
-            }
-            for l in lts
-        ]
+    for kind, x in asynchronousCompositionStream(
+        *lts,
+        partialOrderReduction=partialOrderReduction,
+        reduction=reduction,
+        visited=visited
+    ):
+        if kind == "state":
+            S.append(x)
+        else:
+            T.append(x)
+
+    I = sorted(set(product(*[ l.I for l in lts ])))
+    Σ = sorted({ a for l in lts for a in l.Σ })
+
+    # reachable states (lossy visited sets might omit targets)
+    if visited != "exact":
+        S = set(S)
+        S.update(t for _, _, t in T)
+        S = list(S)
+
+    if sort:
+        S.sort()
+        T.sort()
+
+    return LTS(S, I, Σ, T)
+
+def asynchronousCompositionStream (*lts, partialOrderReduction=None, reduction=None, visited="exact", quit=None):
+    """
+    Streaming asynchronous composition of two or more LTS.
+
+    Generates the asynchronous composition on-the-fly (see
+    :func:`asynchronousComposition`), yielding states as they are discovered
+    (initial states first) and transitions as they are generated, without
+    storing them.
+
+    Args:
+        *lts (variable argument list(LTS)): list of LTS to interleave
+
+    Keyword Args:
+        partialOrderReduction (optional): see :func:`asynchronousComposition`
+        reduction (str - optional): see :func:`asynchronousComposition`
+        visited (str or visited set - optional): see
+            :func:`asynchronousComposition`
+        quit (function - optional): a function ``f: transition -> bool``
+            returning ``True`` if the generation should stop after the given
+            transition
+
+    Returns:
+        generator: yielding ``("state", s)`` for every new state and
+        ``("transition", (s, a, s'))`` for every transition
+    """
+    # validate arguments when called, not on the first step of the generator
+    if reduction not in (None, "ample", "persistent", "stubborn"):
+        raise ValueError("unknown reduction '{}'".format(reduction))
+
+    if reduction is not None and partialOrderReduction is not None:
+        raise ValueError("reduction and partialOrderReduction are exclusive")
+
+    return _asynchronousCompositionStream(
+        lts, partialOrderReduction, reduction, visited, quit
+    )
+
+def _asynchronousCompositionStream (lts, partialOrderReduction, reduction, visited, quit):
+    I = sorted(set(product(*[ l.I for l in lts ])))
+    S = visitedSet(visited, I)
+
+    interleaving = _Interleaving(lts)
 
-    # map of symbols to the set of components knowing that symbol
-    Ψ = { a: { i for i in components if a in lts[i].Σ } for a in Σ }
+    components = interleaving.components
+    Λ = interleaving.Λ
+    Ψ = interleaving.Ψ
+    bit = interleaving.bit
+    participants = interleaving.participants
+    localSuccessors = interleaving.localSuccessors
+    toStates = interleaving.toStates
+    expansion = interleaving.expansion
 
     # initialize dfs stack
     stack = [ (i, [i]) for i in I ]
@@ -392,28 +1281,21 @@ def asynchronousComposition (*lts, partialOrderReduction=None):
     # current path during dfs (to detect back edges)
     path = None
 
-    # on-the-fly generation of reachable states (dfs)
-    def enqueue (successor): stack.append((successor, path + [successor]))
+    # the path is only needed for partial order reduction
+    def enqueue (successor):
+        stack.append(
+            (successor, path + [successor] if partialOrderReduction else None)
+        )
 
-    def cache (successor): S.add(successor)
+    cache = S.add
 
-    def cached (successor): return successor in S
+    cached = S.__contains__
 
     def successors (current):
         nonlocal path
         fromState, path = current
 
-        # dictionary containing successors per symbol and component
-        nextStates = {}
-        for i in components:
-            for (s, a, t) in [ t for t in lts[i].T if t[0] == fromState[i] ]:
-                nextStates.setdefault(a, {}).setdefault(i, []).append(t)
-
-        # generates all successors of a given symbol
-        def toStates (a):
-            return product(*[
-                nextStates[a].get(i, [fromState[i]]) for i in components
-            ])
+        nextStates, enabled = localSuccessors(fromState)
 
         # perform partial order reduction
         if partialOrderReduction:
@@ -440,34 +1322,356 @@ def asynchronousComposition (*lts, partialOrderReduction=None):
                 local = partialOrderReduction(local)
 
                 # fully expand cycles with only partial expansion
+                onPath = set(path)
                 expandCycle = any(
-                    any(s in path for s in toStates(a))
-                    for i in local
-                    for a in Λ[i]
-                    if a in nextStates
+                    s in onPath
+                    for a in { a for i in local for a in Λ[i] if a in nextStates }
+                    for s in toStates(fromState, nextStates, a)
                 )
 
                 # partial expansion - remove successors of skipped components
                 if not expandCycle:
-                    for a in nextStates:
-                        for i in filter(lambda x: x not in local, components):
-                            if i in nextStates[a]:
-                                del nextStates[a][i]
+                    mask = sum(bit[i] for i in local)
+                    enabled = {
+                        a for a in enabled if not participants[a] & ~mask
+                    }
 
-        # build expansion
-        transitions = [
-            (fromState, a, toState)
-            for a in sorted(nextStates.keys(), reverse=True)
-            if Ψ[a] == nextStates[a].keys()
-            for toState in toStates(a)
+        # return expansion
+        return expansion(fromState, nextStates, enabled)
+
+    # symbols leaving the local state of each component
+    def leaving (nextStates):
+        symbols = [ set() for i in components ]
+        for a in nextStates:
+            for i in nextStates[a]:
+                symbols[i].add(a)
+        return symbols
+
+    # ample set: enabled symbols of a component with only local transitions
+    def ample (nextStates, enabled):
+        out = leaving(nextStates)
+        candidates = [
+            { a for a in enabled if a in out[i] }
+            for i in components
+            if out[i] and all(Ψ[a] == { i } for a in out[i])
         ]
+        return min(candidates, key=len, default=enabled)
+
+    # persistent set: enabled symbols of a closed set of components
+    def persistent (nextStates, enabled):
+        out = leaving(nextStates)
+        best = enabled
+        for seed in { i for a in enabled for i in Ψ[a] }:
+            closure = { seed }
+            work = [ seed ]
+            while work:
+                for a in out[work.pop()]:
+                    for j in Ψ[a] - closure:
+                        closure.add(j)
+                        work.append(j)
+
+            reduced = { a for a in enabled if Ψ[a] <= closure }
+            if len(reduced) < len(best):
+                best = reduced
+        return best
+
+    # stubborn set: closure of symbols under dependency and enabling
+    def stubborn (nextStates, enabled):
+        out = leaving(nextStates)
+        best = enabled
+        for seed in sorted(enabled):
+            closure = { seed }
+            work = [ seed ]
+            while work:
+                a = work.pop()
+                if a in enabled:
+                    # all symbols leaving the local states of a's components
+                    scope = Ψ[a]
+                else:
+                    # symbols leaving the local state of a disabling component
+                    scope = [ min(
+                        (i for i in Ψ[a] if i not in nextStates.get(a, {})),
+                        key=lambda i: len(out[i])
+                    ) ]
+                for i in scope:
+                    for b in out[i] - closure:
+                        closure.add(b)
+                        work.append(b)
+
+            reduced = closure & enabled
+            if len(reduced) < len(best):
+                best = reduced
+                if len(best) == 1:
+                    break
+        return best
+
+    reduce = { "ample": ample, "persistent": persistent, "stubborn": stubborn }
+
+    # states on the dfs stack (cycle proviso)
+    onStack = set()
+
+    def reducedSuccessors (fromState):
+        nextStates, enabled = localSuccessors(fromState)
+
+        reduced = reduce[reduction](nextStates, enabled) if enabled else enabled
+
+        transitions = expansion(fromState, nextStates, reduced)
+
+        # fully expand if a reduced expansion closes a cycle
+        if len(reduced) < len(enabled) and \
+                any(t in onStack for _, _, t in transitions):
+            transitions = expansion(fromState, nextStates, enabled)
+
+        return transitions
+
+    for i in I:
+        yield ("state", i)
+
+    if reduction is None:
+        # on-the-fly generation of reachable states (dfs)
+        while stack:
+            transitions = successors(stack.pop())
+
+            for transition in transitions:
+                successor = transition[2]
+                if not cached(successor):
+                    cache(successor)
+                    enqueue(successor)
+                    yield ("state", successor)
+
+                yield ("transition", transition)
+
+                if quit is not None and quit(transition): return
+    else:
+        # dfs keeping track of the states on the stack
+        for initial in I:
+            onStack.add(initial)
+            branches = [ (initial, iter(reducedSuccessors(initial))) ]
+
+            while branches:
+                state, branch = branches[-1]
+
+                for transition in branch:
+                    successor = transition[2]
+                    new = not cached(successor)
+                    if new:
+                        cache(successor)
+                        yield ("state", successor)
+
+                    yield ("transition", transition)
+
+                    if quit is not None and quit(transition): return
+
+                    if new:
+                        onStack.add(successor)
+                        branches.append(
+                            (successor, iter(reducedSuccessors(successor)))
+                        )
+                        break
+                else:
+                    branches.pop()
+                    onStack.discard(state)
+
+def _owner (state, workers):
+    """Returns the worker owning a state (stable among processes)."""
+    return zlib.crc32(repr(state).encode()) % workers
+
+def _distributedWorker (w, lts, initial, inboxes, results, batch, directory):
+    """
+    Worker process of :func:`distributedComposition`.
+
+    Expands the owned states, sends successors owned by other workers in
+    batches and takes part in Safra's termination detection: the token
+    travels the ring n-1, ..., 1, 0 carrying the sum of the message counters
+    (sent - received) and a color, which is black if any worker received a
+    message since the token last passed it. Worker 0 detects termination if
+    a white token returns to it with a total count of zero.
+    """
+    try:
+        n = len(inboxes)
+        interleaving = _Interleaving(lts)
+        inbox = inboxes[w]
 
-        # add transitions
-        T.extend(transitions)
+        visited = set(initial)
+        work = list(initial)
+        T = []
 
-        # return expansion
-        return [ t for _, _, t in transitions ]
+        # successors owned by other workers
+        outboxes = [ [] for d in range(n) ]
+
+        # Safra: message counter, color, token held and probe running
+        counter = 0
+        black = False
+        token = None
+        probing = False
+        done = False
+
+        def send (d):
+            nonlocal counter
+            inboxes[d].put(("states", outboxes[d]))
+            outboxes[d] = []
+            counter += 1
+
+        def receive (message):
+            nonlocal counter, black, token, done
+            if message[0] == "states":
+                counter -= 1
+                black = True
+                for s in message[1]:
+                    if s not in visited:
+                        visited.add(s)
+                        work.append(s)
+            elif message[0] == "token":
+                token = message[1:]
+            else:
+                done = True
+
+        while not done:
+            # active - receive pending messages and expand a batch of states
+            if work:
+                while True:
+                    try:
+                        receive(inbox.get_nowait())
+                    except Empty:
+                        break
+
+                for i in range(min(batch, len(work))):
+                    for transition in interleaving.expand(work.pop()):
+                        T.append(transition)
+
+                        successor = transition[2]
+                        d = _owner(successor, n)
+                        if d == w:
+                            if successor not in visited:
+                                visited.add(successor)
+                                work.append(successor)
+                        else:
+                            outboxes[d].append(successor)
+                            if len(outboxes[d]) >= batch:
+                                send(d)
+
+                continue
+
+            # passive - flush outboxes and pass the token
+            for d in range(n):
+                if outboxes[d]:
+                    send(d)
+
+            if w == 0 and not probing:
+                probing = True
+                black = False
+                inboxes[n - 1].put(("token", 0, False))
+            elif token is not None:
+                count, tokenBlack = token
+                token = None
+
+                if w > 0:
+                    inboxes[w - 1].put(("token", count + counter, tokenBlack or black))
+                    black = False
+                elif not tokenBlack and not black and count + counter == 0:
+                    for d in range(1, n):
+                        inboxes[d].put(("stop",))
+                    break
+                else:
+                    black = False
+                    inboxes[n - 1].put(("token", 0, False))
+
+            receive(inbox.get())
+
+        if directory is None:
+            results.put((w, visited, T))
+        else:
+            path = os.path.join(directory, "partition-{}".format(w))
+            with open(path, "wb") as f:
+                pickle.dump((sorted(visited), T), f)
+            results.put((w, path))
+
+    except BaseException:
+        results.put((w, RuntimeError(traceback.format_exc())))
+
+def distributedComposition (*lts, workers=None, batch=1024, directory=None):
+    """
+    Distributed asynchronous composition of two or more LTS.
+
+    Every state is owned by the worker process chosen by a (stable) hash of
+    the state. Workers expand their own states and send successors owned by
+    other workers in batches over queues. Termination is detected using
+    Safra's token ring algorithm.
+
+    Args:
+        *lts (variable argument list(LTS)): list of LTS to interleave
+
+    Keyword Args:
+        workers (int): number of worker processes (default: number of CPUs)
+        batch (int): number of successors sent at once (and states expanded
+            between checking for messages)
+        directory (str - optional): directory for storing a transition file
+            per worker (``partition-<worker>``, containing the pickled tuple
+            of the worker's states and transitions leaving them) instead of
+            returning the composition
+
+    Returns:
+        LTS: the composition (see :func:`asynchronousComposition`) or the
+        list of partition files, if **directory** is given
+
+    Note:
+        States are assigned to workers by hashing their ``repr``, which
+        therefore must be deterministic.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError("workers must be positive")
+
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+
+    I = sorted(set(product(*[ l.I for l in lts ])))
+    Σ = sorted({ a for l in lts for a in l.Σ })
+
+    # distribute initial states
+    initial = [ [] for w in range(workers) ]
+    for s in I:
+        initial[_owner(s, workers)].append(s)
+
+    inboxes = [ multiprocessing.Queue() for w in range(workers) ]
+    results = multiprocessing.Queue()
+
+    processes = [
+        multiprocessing.Process(
+            target=_distributedWorker,
+            args=(w, lts, initial[w], inboxes, results, batch, directory)
+        )
+        for w in range(workers)
+    ]
+
+    for process in processes:
+        process.start()
+
+    try:
+        partitions = [ None ] * workers
+        for i in range(workers):
+            result = results.get()
+            if isinstance(result[1], BaseException):
+                raise result[1]
+            partitions[result[0]] = result[1:]
+
+        for process in processes:
+            process.join()
 
-    dfs(stack, successors, enqueue=enqueue, cache=cache, cached=cached)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    if directory is not None:
+        return [ path for (path,) in partitions ]
+
+    S = set()
+    T = []
+    for states, transitions in partitions:
+        S.update(states)
+        T.extend(transitions)
 
-    return LTS(sorted(S), I, sorted(Σ), sorted(T))
+    return LTS(sorted(S), I, Σ, sorted(T))
@@ -0,0 +1,302 @@
+from .utils import hashable
+
+def paigeTarjan (S, T, P=None):
+    """
+    Paige-Tarjan Algorithm (relational coarsest partition).
+
+    Computes the coarsest partition of S refining **P**, which is stable
+    with respect to the labelled transition relation T (i.e. the strong
+    bisimulation equivalence) in O(|T| log |S|).
+
+    Args:
+        S (iterable): set of states
+        T (iterable): transition relation T ⊆ SxΣxS
+        P (list of lists - optional): initial partition of S (default: [S])
+
+    Returns:
+        list: coarsest stable partition (list of blocks, i.e. list of states
+        in order of S)
+    """
+    S = list(S)
+
+    # map states to integer ids
+    ids = { hashable(s): i for i, s in enumerate(S) }
+
+    # transitions (source, label, target) and incoming transitions per state
+    src = []
+    lbl = []
+    incoming = [ [] for s in S ]
+    outgoing = {}
+
+    for (s, a, t) in T:
+        s = ids[hashable(s)]
+        t = ids[hashable(t)]
+        incoming[t].append(len(src))
+        outgoing.setdefault((s, a), []).append(len(src))
+        src.append(s)
+        lbl.append(a)
+
+    # blocks (sets of states) and the block of each state
+    if P is None:
+        P = [ S ]
+
+    blocks = [ { ids[hashable(s)] for s in b } for b in P if b ]
+    blockOf = [ None ] * len(S)
+
+    for b in range(len(blocks)):
+        for s in blocks[b]:
+            blockOf[s] = b
+
+    if None in blockOf:
+        raise ValueError("initial partition does not cover S")
+
+    # compound blocks (sets of blocks) and the compound of each block
+    compounds = [ set(range(len(blocks))) ]
+    compoundOf = [ 0 ] * len(blocks)
+
+    # stack of compound blocks containing more than one block
+    nonSimple = []
+
+    # split all blocks into marked and unmarked states
+    def split (marked):
+        touched = {}
+        for s in marked:
+            touched.setdefault(blockOf[s], []).append(s)
+
+        for b, states in touched.items():
+            if len(states) == len(blocks[b]):
+                continue
+
+            new = len(blocks)
+            blocks.append(set(states))
+            blocks[b].difference_update(states)
+            for s in states:
+                blockOf[s] = new
+
+            c = compoundOf[b]
+            compoundOf.append(c)
+            compounds[c].add(new)
+            if len(compounds[c]) == 2:
+                nonSimple.append(c)
+
+    if len(blocks) > 1:
+        nonSimple.append(0)
+
+    # count(s, a, C): number of a-transitions from s into compound C, shared
+    # by all transitions represented by the counter (initially C = S)
+    count = [ None ] * len(src)
+
+    for (s, a), transitions in outgoing.items():
+        counter = [ len(transitions) ]
+        for t in transitions:
+            count[t] = counter
+
+    # make initial partition stable with respect to the compound block S
+    enabled = {}
+    for (s, a) in outgoing:
+        enabled.setdefault(a, []).append(s)
+
+    for states in enabled.values():
+        split(states)
+
+    # refine until all compound blocks are simple
+    while nonSimple:
+        C = nonSimple.pop()
+
+        # select the smaller of the first two blocks of C as splitter B
+        it = iter(compounds[C])
+        B = min(next(it), next(it), key=lambda b: len(blocks[b]))
+
+        # move B into a new compound block
+        compounds[C].remove(B)
+        if len(compounds[C]) > 1:
+            nonSimple.append(C)
+
+        compoundOf[B] = len(compounds)
+        compounds.append({ B })
+
+        # transitions into B grouped by label
+        preB = {}
+        for s in blocks[B]:
+            for t in incoming[s]:
+                preB.setdefault(lbl[t], []).append(t)
+
+        for a, transitions in preB.items():
+
+            # count(s, a, B) for all s ∊ pre_a(B)
+            countB = {}
+            countC = {}
+            for t in transitions:
+                s = src[t]
+                countB[s] = countB.get(s, 0) + 1
+                countC[s] = count[t]
+
+            # split with respect to pre_a(B)
+            split(countB.keys())
+
+            # split with respect to pre_a(B) \ pre_a(C \ B)
+            split([ s for s in countB if countB[s] == countC[s][0] ])
+
+            # update counters
+            counters = {}
+            for s in countB:
+                countC[s][0] -= countB[s]
+                counters[s] = [ countB[s] ]
+
+            for t in transitions:
+                count[t] = counters[src[t]]
+
+    # return blocks in order of S
+    partition = {}
+    for s in range(len(S)):
+        partition.setdefault(blockOf[s], []).append(S[s])
+
+    return list(partition.values())
+
+class _RefinablePartition:
+    """
+    Refinable partition of the integers 0..n-1 (Valmari-Lehtinen).
+
+    Elements of a set are stored contiguously, marked elements are moved to
+    the front of their set and splitting moves the smaller part into a new
+    set.
+    """
+    def __init__ (self, n):
+        self.elems = list(range(n))
+        self.loc = list(range(n))
+        self.sidx = [ 0 ] * n
+        self.first = [ 0 ]
+        self.end = [ n ]
+        self.mid = [ 0 ]
+        self.touched = []
+
+    def __len__ (self):
+        return len(self.first)
+
+    def mark (self, e):
+        s = self.sidx[e]
+        i = self.loc[e]
+        j = self.first[s] + self.mid[s]
+
+        if i < j:
+            return
+
+        self.elems[i] = self.elems[j]
+        self.loc[self.elems[i]] = i
+        self.elems[j] = e
+        self.loc[e] = j
+
+        if not self.mid[s]:
+            self.touched.append(s)
+
+        self.mid[s] += 1
+
+    def split (self):
+        while self.touched:
+            s = self.touched.pop()
+            j = self.first[s] + self.mid[s]
+
+            if j == self.end[s]:
+                self.mid[s] = 0
+                continue
+
+            # the smaller part becomes a new set
+            if self.mid[s] <= self.end[s] - j:
+                self.first.append(self.first[s])
+                self.end.append(j)
+                self.first[s] = j
+            else:
+                self.first.append(j)
+                self.end.append(self.end[s])
+                self.end[s] = j
+
+            new = len(self.first) - 1
+            for i in range(self.first[new], self.end[new]):
+                self.sidx[self.elems[i]] = new
+
+            self.mid[s] = 0
+            self.mid.append(0)
+
+    def members (self, s):
+        return self.elems[self.first[s]:self.end[s]]
+
+def hopcroft (S, T, P=None):
+    """
+    Hopcroft's Algorithm (minimization of deterministic automata).
+
+    Computes the coarsest partition of S refining **P**, which is compatible
+    with a deterministic (possibly partial) transition relation T, in
+    O(|T| log |S|) using Valmari and Lehtinen's formulation, splitting sets of
+    transitions (grouped by label and target block) instead of enumerating
+    the alphabet for every splitter.
+
+    Args:
+        S (iterable): set of states
+        T (iterable): deterministic transition relation T ⊆ SxΣxS
+        P (list of lists - optional): initial partition of S (default: [S])
+
+    Returns:
+        list: coarsest compatible partition (list of blocks, i.e. list of
+        states in order of S)
+
+    Note:
+        For nondeterministic transition relations use :func:`paigeTarjan`.
+    """
+    S = list(S)
+
+    # map states to integer ids
+    ids = { hashable(s): i for i, s in enumerate(S) }
+
+    # transitions grouped by label and incoming transitions per state
+    tail = []
+    labels = {}
+    incoming = [ [] for s in S ]
+
+    for (s, a, t) in T:
+        incoming[ids[hashable(t)]].append(len(tail))
+        labels.setdefault(a, []).append(len(tail))
+        tail.append(ids[hashable(s)])
+
+    # partition of states
+    B = _RefinablePartition(len(S))
+
+    if P is not None:
+        if sum(len(b) for b in P) != len(S):
+            raise ValueError("initial partition does not cover S")
+
+        for b in P[1:]:
+            for s in b:
+                B.mark(ids[hashable(s)])
+            B.split()
+
+    # partition of transitions (cords), initially grouped by label
+    C = _RefinablePartition(len(tail))
+
+    for transitions in list(labels.values())[1:]:
+        for t in transitions:
+            C.mark(t)
+        C.split()
+
+    # split blocks by cords and cords by new blocks
+    b = 1
+    c = 0
+
+    while c < len(C):
+        for t in C.members(c):
+            B.mark(tail[t])
+        B.split()
+        c += 1
+
+        while b < len(B):
+            for s in B.members(b):
+                for t in incoming[s]:
+                    C.mark(t)
+            C.split()
+            b += 1
+
+    # return blocks in order of S
+    partition = {}
+    for s in range(len(S)):
+        partition.setdefault(B.sidx[s], []).append(S[s])
+
+    return list(partition.values())
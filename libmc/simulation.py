@@ -0,0 +1,96 @@
+from .utils import hashable
+
+def hhk (S1, T1, S2, T2, R0):
+    """
+    Henzinger-Henzinger-Kopke Algorithm (maximum simulation).
+
+    Computes the maximum simulation relation R ⊆ R0 between two labelled
+    transition relations, i.e. the largest R ⊆ R0 such that for all
+    (s, t) ∊ R and s -a> s' there is a t -a> t' with (s', t') ∊ R.
+
+    Instead of recomputing the relation until a fixpoint is reached, for each
+    state s' of S1 and label a, the number of a-successors of every t ∊ S2
+    simulating s' is counted. States t whose counter drops to zero are
+    collected in remove sets and removed from the simulators of all
+    a-predecessors of s', which results in O(|S1||T2| + |T1||S2|) time.
+
+    Args:
+        S1 (iterable): set of states of the simulated system
+        T1 (iterable): transition relation T1 ⊆ S1xΣxS1
+        S2 (iterable): set of states of the simulating system
+        T2 (iterable): transition relation T2 ⊆ S2xΣxS2
+        R0 (iterable): the starting relation, e.g. S1xS2
+
+    Returns:
+        set: R ⊆ R0 - the maximum simulation relation
+    """
+    S1 = list(S1)
+    S2 = list(S2)
+
+    # map states to integer ids
+    ids1 = { hashable(s): i for i, s in enumerate(S1) }
+    ids2 = { hashable(s): i for i, s in enumerate(S2) }
+
+    # predecessors per state and label
+    pre1 = [ {} for s in S1 ]
+    for (s, a, t) in T1:
+        pre1[ids1[hashable(t)]].setdefault(a, []).append(ids1[hashable(s)])
+
+    pre2 = [ {} for s in S2 ]
+    for (s, a, t) in T2:
+        pre2[ids2[hashable(t)]].setdefault(a, []).append(ids2[hashable(s)])
+
+    # sim(s): states simulating s
+    sim = [ set() for s in S1 ]
+    for (s, t) in R0:
+        s = ids1.get(hashable(s))
+        t = ids2.get(hashable(t))
+        if s is not None and t is not None:
+            sim[s].add(t)
+
+    # count(s', a)[t]: number of a-successors of t simulating s'
+    count = {}
+
+    # remove(s', a): states without an a-successor simulating s'
+    remove = {}
+
+    for _s in range(len(S1)):
+        for a in pre1[_s]:
+            counter = {}
+            for _t in sim[_s]:
+                for t in pre2[_t].get(a, []):
+                    counter[t] = counter.get(t, 0) + 1
+
+            count[(_s, a)] = counter
+            remove[(_s, a)] = { t for t in range(len(S2)) if t not in counter }
+
+    # remove sets to process
+    stack = [ key for key in remove if remove[key] ]
+
+    while stack:
+        _s, a = stack.pop()
+        removed = remove[(_s, a)]
+        remove[(_s, a)] = set()
+
+        # t can not simulate any a-predecessor of s'
+        for s in pre1[_s][a]:
+            for t in removed:
+                if t not in sim[s]:
+                    continue
+
+                sim[s].remove(t)
+
+                # update counters of all predecessors of t
+                for b, predecessors in pre2[t].items():
+                    counter = count.get((s, b))
+                    if counter is None:
+                        continue
+
+                    for u in predecessors:
+                        counter[u] -= 1
+                        if not counter[u]:
+                            if not remove[(s, b)]:
+                                stack.append((s, b))
+                            remove[(s, b)].add(u)
+
+    return { (S1[s], S2[t]) for s in range(len(S1)) for t in sim[s] }
@@ -0,0 +1,219 @@
+from bisect import bisect_right
+
+from .bdd import BDD
+from .utils import hashable
+
+def _count (f, variables):
+    """
+    Returns the number of satisfying assignments of f over the given
+    variables (without enumerating them).
+    """
+    levels = sorted(BDD(v).level for v in variables)
+
+    # number of the variables at or below level l
+    def below (l):
+        return bisect_right(levels, l)
+
+    cache = {}
+
+    # assignments of the variables at or below f's level satisfying f
+    def count (f):
+        if f.isConstant():
+            return 1 if f else 0
+
+        if f in cache:
+            return cache[f]
+
+        node = ~f if f.sign else f
+
+        res = sum(
+            2 ** (below(f.level) - 1 - below(child.level)) * count(child)
+            for child in node.child
+        )
+
+        if f.sign:
+            res = 2 ** below(f.level) - res
+
+        cache[f] = res
+
+        return res
+
+    return 2 ** (len(levels) - below(f.level)) * count(f)
+
+class SymbolicComposition:
+    """
+    Symbolic representation of the reachable states of an asynchronous
+    composition.
+
+    The local states of component i are encoded in binary by the BDD
+    variables ``variables[i]`` (component 0 is encoded by the lowest indices)
+    and their successors by the *next state* variables ``primed[i]``, each
+    placed directly above its current state variable.
+
+    The transition relation is partitioned by label: the BDD T_a(x, x')
+    relates the local states of the components knowing a to their
+    a-successors and is built from the local transitions only (as the
+    conjunction of the components' relations). Components not knowing a
+    keep their state, hence their variables do not occur in T_a.
+
+    Attributes:
+        lts (list(LTS)): the components
+        variables (list(list(int))): BDD variable indices of each component
+        primed (list(list(int))): next state variable indices of each
+            component
+        R (BDD): the set of reachable states
+        count (int): the number of reachable states
+        iterations (int): number of image computations
+    """
+    def __init__ (self, *lts):
+        self.lts = lts
+
+        # map local states to codes and assign variables
+        self._codes = [
+            { hashable(s): j for j, s in enumerate(l.S) }
+            for l in lts
+        ]
+
+        self.variables = []
+        self.primed = []
+        n = 0
+        for l in lts:
+            bits = max(len(l.S) - 1, 0).bit_length()
+            self.variables.append(list(range(n, n + 2 * bits, 2)))
+            self.primed.append(list(range(n + 1, n + 2 * bits, 2)))
+            n += 2 * bits
+
+        # initial states
+        I = BDD.true()
+        for i, l in enumerate(lts):
+            I = I & self._union(i, l.I, self.variables)
+
+        # partitioned transition relation and reachable states
+        self._T = self._partition()
+        self.iterations = 0
+        self.R = self._reachable(I)
+        self.count = _count(self.R, [ v for V in self.variables for v in V ])
+
+    def _assignment (self, i, s, variables=None):
+        # assignment of component i's variables encoding local state s
+        if variables is None:
+            variables = self.variables
+
+        code = self._codes[i][hashable(s)]
+        return {
+            v: bool(code >> bit & 1)
+            for bit, v in enumerate(variables[i])
+        }
+
+    def _cube (self, i, s, variables):
+        # BDD encoding local state s of component i
+        cube = BDD.true()
+        for v, value in self._assignment(i, s, variables).items():
+            cube = cube & (BDD(v) if value else ~BDD(v))
+        return cube
+
+    def _union (self, i, states, variables):
+        # BDD encoding a set of local states of component i
+        union = BDD.false()
+        for s in states:
+            union = union | self._cube(i, s, variables)
+        return union
+
+    def _partition (self):
+        """
+        Returns the transition relation partitioned by label.
+
+        For every label a, the relation consists of the BDD T_a, the current
+        state variables of the components knowing a (to quantify) and the
+        renaming of their next state variables to current state variables.
+
+        Labels are grouped by their topmost component (saturation order).
+        """
+        Σ = { a for l in self.lts for a in l.Σ }
+
+        partition = {}
+        for a in sorted(Σ):
+            Ψ = [ i for i, l in enumerate(self.lts) if a in l.Σ ]
+
+            # T_a = ∧ { T_a,i | i ∊ Ψ } with T_a,i = ∨ { s ∧ t' | s -a> t }
+            T = BDD.true()
+            for i in Ψ:
+                local = BDD.false()
+                for (s, _a, t) in self.lts[i].T:
+                    if _a == a:
+                        local = local | (
+                            self._cube(i, s, self.variables) &
+                            self._cube(i, t, self.primed)
+                        )
+                T = T & local
+
+            if T.isConstant() and not T:
+                continue
+
+            partition.setdefault(Ψ[-1], []).append((
+                T,
+                [ v for i in Ψ for v in self.variables[i] ],
+                {
+                    w: v
+                    for i in Ψ
+                    for v, w in zip(self.variables[i], self.primed[i])
+                }
+            ))
+
+        return [ partition.get(i, []) for i in range(len(self.lts)) ]
+
+    def _image (self, R, relation):
+        # successors of R with respect to the relation of a single label
+        T, variables, rename = relation
+
+        self.iterations += 1
+
+        return R.andExists(T, variables).rename(rename)
+
+    def _reachable (self, I):
+        """
+        Computes the reachable states (least fixpoint).
+
+        Labels are fired in saturation order: the labels of the lower
+        components are saturated before those of the next component are
+        fired, which are saturated together with all lower labels again.
+        """
+        R = I
+        for k in range(len(self.lts)):
+            changed = True
+            while changed:
+                changed = False
+                for relations in self._T[:k + 1]:
+                    for relation in relations:
+                        _R = R | self._image(R, relation)
+                        if _R != R:
+                            R = _R
+                            changed = True
+        return R
+
+    def __contains__ (self, state):
+        assignment = {}
+        for i, s in enumerate(state):
+            if hashable(s) not in self._codes[i]:
+                return False
+            assignment.update(self._assignment(i, s))
+
+        return bool(self.R.restrict(assignment))
+
+def symbolicComposition (*lts):
+    """
+    Symbolic reachability analysis of the asynchronous composition of two or
+    more LTS (see :func:`~libmc.asynchronousComposition`).
+
+    The local states of every component are encoded by BDD variables, the
+    transition relation is partitioned by label and the reachable states are
+    computed by image computation, without enumerating them.
+
+    Args:
+        *lts (variable argument list(LTS)): list of LTS to interleave
+
+    Returns:
+        SymbolicComposition: the set of reachable states (``R``) and their
+        number (``count``)
+    """
+    return SymbolicComposition(*lts)
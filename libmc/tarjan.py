@@ -1,23 +1,61 @@
-from math import inf
+from array import array
 
-def tarjan (nodes, edges):
+def tarjan (nodes, edges=None):
     """
     Tarjan's Algorithm (p110).
 
     Find strongly connected components in a directed graph.
 
+    The search is iterative (no recursion limit) and runs in O(|V| + |E|)
+    on a compressed sparse row (CSR) adjacency built once from the edges.
+
     Args:
-        nodes (iterable): set of nodes
-        edges (iterable): set of edges (pairs of nodes)
+        nodes (iterable or CompactLTS): set of nodes or a
+            :class:`~libmc.lts.CompactLTS`, whose CSR adjacency is used
+            directly (nodes are the interned states)
+        edges (iterable - optional): set of edges (pairs of nodes), if
+            **nodes** is not a :class:`~libmc.lts.CompactLTS`
 
     Returns:
         list: set of strongly connected components (list of nodes)
     """
-    # depth first search index (DFSI)
-    dfsi = { s: 0 for s in nodes }
+    if edges is None:
+        # CSR adjacency of a compact LTS
+        offset = nodes.offset
+        target = nodes.target
+        n = len(offset) - 1
+        nodes = range(n)
+    else:
+        nodes = list(nodes)
+        edges = list(edges)
+
+        # map nodes to integer ids
+        ids = { node: i for i, node in enumerate(nodes) }
+        n = len(nodes)
+
+        # CSR adjacency: children of node v are target[offset[v]:offset[v + 1]]
+        offset = array('l', [ 0 ]) * (n + 1)
+        for (s, t) in edges:
+            offset[ids[s] + 1] += 1
+
+        for v in range(n):
+            offset[v + 1] += offset[v]
+
+        target = array('l', [ 0 ]) * len(edges)
+        position = array('l', offset)
+        for (s, t) in edges:
+            s = ids[s]
+            target[position[s]] = ids[t]
+            position[s] += 1
+
+    # depth first search index (DFSI) - 0 if not visited yet
+    dfsi = array('l', [ 0 ]) * n
 
     # min. reachable DFSI through back edges (MRDFSI)
-    mrdfsi = { s: inf for s in nodes }
+    mrdfsi = array('l', [ 0 ]) * n
+
+    # nodes on the auxiliary stack
+    onStack = bytearray(n)
 
     # auxiliary stack
     stack = []
@@ -28,51 +66,54 @@ def tarjan (nodes, edges):
     # map of strongly connected components: root node -> SCC (list of nodes)
     scc = {}
 
-    # compute a node's DFSI and MRDFSI recursively
-    def tarjan_aux (node, i, stack):
-
-        # return if the node's DFSI is already known
-        if dfsi[node] != 0: return i
-
-        # increment the index
-        i = i + 1
-
-        # set the node's DFSI and MRDFSI
-        dfsi[node] = i
-        mrdfsi[node] = i
-
-        # push newly reached node on the auxiliary stack
-        stack.append(node)
+    for root in range(n):
 
-        # find children
-        children = [ t for (s, t) in edges if s == node ]
+        # skip nodes whose DFSI is already known
+        if dfsi[root]:
+            continue
 
-        # compute DFSI and MRDFSI of all child nodes
-        for child in children:
-            i = tarjan_aux(child, i, stack)
+        # DFS stack of (node, position of the next child in target)
+        path = [ (root, offset[root]) ]
 
-        # minimize MRDFSI over the MRDFSI of each node and it's direct children
-        for child in children:
-            mrdfsi[node] = min(mrdfsi[node], mrdfsi[child])
-
-        # return index if it's not a root node
-        if dfsi[node] != mrdfsi[node]:
-            return i
-
-        # generate the node's SCC
-        def add2scc (node):
-            child = stack.pop()
-            scc.setdefault(node, []).append(child)
-            mrdfsi[child] = inf
-            return child
-
-        while add2scc(node) != node: pass
-
-        return i
-
-    # compute each node's DFSI and MRDFSI
-    for node in nodes:
-        i = tarjan_aux(node, i, stack)
+        i = i + 1
+        dfsi[root] = mrdfsi[root] = i
+        stack.append(root)
+        onStack[root] = 1
+
+        while path:
+            node, child = path[-1]
+
+            # visit next child
+            if child < offset[node + 1]:
+                path[-1] = (node, child + 1)
+                child = target[child]
+
+                if not dfsi[child]:
+                    i = i + 1
+                    dfsi[child] = mrdfsi[child] = i
+                    stack.append(child)
+                    onStack[child] = 1
+                    path.append((child, offset[child]))
+                elif onStack[child]:
+                    mrdfsi[node] = min(mrdfsi[node], dfsi[child])
+
+                continue
+
+            # all children visited - propagate MRDFSI to the parent
+            path.pop()
+            if path:
+                parent = path[-1][0]
+                mrdfsi[parent] = min(mrdfsi[parent], mrdfsi[node])
+
+            # generate the SCC of a root node
+            if dfsi[node] == mrdfsi[node]:
+                component = scc.setdefault(nodes[node], [])
+                while True:
+                    child = stack.pop()
+                    onStack[child] = 0
+                    component.append(nodes[child])
+                    if child == node:
+                        break
 
     # return the list of strongly connected components
     return [ sorted(scc[node]) for node in nodes if node in scc ]
@@ -1,6 +1,347 @@
+from array import array
+from ast import literal_eval
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heappush, heappop, merge
+from itertools import count
+from math import exp
+from os import cpu_count
+import json
+import os
+import struct
+
+class Queue:
+    """
+    FIFO frontier (based on :class:`collections.deque`).
+
+    Frontiers implement a small protocol used by :func:`bfs` and
+    :func:`dfs`:
+
+    * ``push(x)``: add an object to the frontier
+    * ``pop()``: remove and return the next object to expand
+    * ``len(frontier)``: number of objects in the frontier
+    * ``iter(frontier)``: objects in the frontier (used to initialize the
+      default cache)
+
+    Args:
+        items (iterable - optional): initial contents
+    """
+    def __init__ (self, items=()):
+        self.items = deque(items)
+
+    def __len__ (self):
+        return len(self.items)
+
+    def __iter__ (self):
+        return iter(self.items)
+
+    def push (self, x):
+        self.items.append(x)
+
+    def pop (self):
+        return self.items.popleft()
+
+class Stack:
+    """
+    LIFO frontier, optionally bounded (e.g. for iterative deepening).
+
+    If a **limit** is given, objects whose depth exceeds the limit are
+    discarded and :attr:`cutoff` is set, indicating that the search has to be
+    repeated with a larger limit to be complete.
+
+    Args:
+        items (iterable - optional): initial contents
+        limit (int - optional): maximum depth of pushed objects
+        depth (function - optional): a function ``f: object -> int``
+            returning the depth of a given object (required by **limit**)
+    """
+    def __init__ (self, items=(), limit=None, depth=None):
+        if limit is not None and depth is None:
+            raise ValueError("missing 'depth' argument")
+
+        self.items = list(items)
+        self.limit = limit
+        self.depth = depth
+        self.cutoff = False
+
+    def __len__ (self):
+        return len(self.items)
+
+    def __iter__ (self):
+        return iter(self.items)
+
+    def push (self, x):
+        if self.limit is not None and self.depth(x) > self.limit:
+            self.cutoff = True
+        else:
+            self.items.append(x)
+
+    def pop (self):
+        return self.items.pop()
+
+class PriorityQueue:
+    """
+    Priority frontier (binary heap) for best-first search and A*.
+
+    Objects with the smallest key are expanded first, ties are broken in
+    insertion order.
+
+    Args:
+        key (function): a function ``f: object -> priority`` (e.g. ``g + h``
+            for A*)
+        items (iterable - optional): initial contents
+    """
+    def __init__ (self, key, items=()):
+        self.key = key
+        self.heap = []
+        self.counter = count()
+        for x in items:
+            self.push(x)
+
+    def __len__ (self):
+        return len(self.heap)
+
+    def __iter__ (self):
+        return (x for (k, i, x) in self.heap)
+
+    def push (self, x):
+        heappush(self.heap, (self.key(x), next(self.counter), x))
+
+    def pop (self):
+        return heappop(self.heap)[2]
+
+class __ListQueue__:
+    """
+    FIFO view on a list, dequeuing in O(1) by advancing a head index.
+
+    Objects appended to the list (e.g. by a custom **enqueue** function) are
+    part of the queue. Consumed objects are removed from time to time and
+    when the search terminates.
+    """
+    def __init__ (self, items):
+        self.items = items
+        self.head = 0
+
+    def __len__ (self):
+        return len(self.items) - self.head
+
+    def __iter__ (self):
+        return iter(self.items[self.head:])
+
+    def push (self, x):
+        self.items.append(x)
+
+    def pop (self):
+        x = self.items[self.head]
+        self.head += 1
+        if self.head >= 1024 and self.head * 2 >= len(self.items):
+            self.compact()
+        return x
+
+    def compact (self):
+        del self.items[:self.head]
+        self.head = 0
+
+# 64 bit mask
+__M64__ = (1 << 64) - 1
+
+def __mix64__ (h):
+    # SplitMix64 finalizer spreading the bits of Python's hash
+    z = (h + 0x9E3779B97F4A7C15) & __M64__
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & __M64__
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & __M64__
+    return z ^ (z >> 31)
+
+class ExactSet:
+    """
+    Exact visited set (based on :class:`set`).
+
+    Visited sets implement a small protocol used by :func:`bfs`, :func:`dfs`
+    and :func:`~libmc.asynchronousComposition`:
+
+    * ``add(x)``: mark an object as visited
+    * ``x in visited``: check if an object has been visited
+    * ``len(visited)``: number of objects added
+    * ``omissionProbability()``: estimated probability of having missed
+      objects due to hash collisions
+
+    Args:
+        items (iterable - optional): initial contents
+    """
+    def __init__ (self, items=()):
+        self.items = set(items)
+
+    def __len__ (self):
+        return len(self.items)
+
+    def __contains__ (self, x):
+        return x in self.items
+
+    def add (self, x):
+        self.items.add(x)
+
+    def omissionProbability (self):
+        return 0.0
+
+class HashCompaction:
+    """
+    Hash compaction visited set.
+
+    Instead of the objects themselves, only their 64 bit fingerprints are
+    stored in an open addressing table (linear probing) backed by an
+    :class:`array.array`, i.e. 8 bytes per object (at load factor <= 1/2).
+    Objects whose fingerprint collides with one of a visited object are
+    considered visited.
+
+    Args:
+        items (iterable - optional): initial contents
+        capacity (int - optional): initial number of slots (power of 2)
+    """
+    def __init__ (self, items=(), capacity=1024):
+        if capacity < 1 or capacity & (capacity - 1):
+            raise ValueError("capacity must be a power of 2")
+
+        self.table = array('Q', [ 0 ]) * capacity
+        self.size = 0
+        for x in items:
+            self.add(x)
+
+    def __len__ (self):
+        return self.size
+
+    # fingerprint (0 marks empty slots) and its slot
+    def __find__ (self, x):
+        fingerprint = __mix64__(hash(x)) or 1
+        mask = len(self.table) - 1
+        i = fingerprint & mask
+        while self.table[i] and self.table[i] != fingerprint:
+            i = (i + 1) & mask
+        return fingerprint, i
+
+    def __contains__ (self, x):
+        return bool(self.table[self.__find__(x)[1]])
+
+    def add (self, x):
+        fingerprint, i = self.__find__(x)
+        if self.table[i]:
+            return
+
+        self.table[i] = fingerprint
+        self.size += 1
+
+        # rehash at load factor 1/2
+        if 2 * self.size > len(self.table):
+            table = self.table
+            self.table = array('Q', [ 0 ]) * (2 * len(table))
+            mask = len(self.table) - 1
+            for fingerprint in table:
+                if fingerprint:
+                    i = fingerprint & mask
+                    while self.table[i]:
+                        i = (i + 1) & mask
+                    self.table[i] = fingerprint
+
+    def omissionProbability (self):
+        # probability of a collision among n fingerprints (birthday bound)
+        return 1 - exp(-self.size * (self.size - 1) / 2 ** 65)
+
+class Bitstate:
+    """
+    Bitstate hashing (supertrace) visited set.
+
+    Every object sets **k** bits of a bit array of size **bits** (stored in a
+    :class:`bytearray`) and is considered visited if all of its bits are set
+    already.
+
+    Args:
+        items (iterable - optional): initial contents
+        bits (int - optional): size of the bit array (default: 2^27 bits, i.e.
+            16 MiB)
+        k (int - optional): number of hash functions
+    """
+    def __init__ (self, items=(), bits=1 << 27, k=3):
+        if bits < 8 or k < 1:
+            raise ValueError("bits must be >= 8 and k positive")
+
+        self.bits = bytearray((bits + 7) // 8)
+        self.m = len(self.bits) * 8
+        self.k = k
+        self.size = 0
+        self.ones = 0
+        self.omissions = 0.0
+        for x in items:
+            self.add(x)
+
+    def __len__ (self):
+        return self.size
+
+    # indices of the k bits (double hashing)
+    def __indices__ (self, x):
+        h1 = __mix64__(hash(x))
+        h2 = __mix64__(h1) | 1
+        return [ (h1 + i * h2) % self.m for i in range(self.k) ]
+
+    def __contains__ (self, x):
+        return all(
+            self.bits[i >> 3] & (1 << (i & 7))
+            for i in self.__indices__(x)
+        )
+
+    def add (self, x):
+        # probability of the new object being considered visited already
+        self.omissions += (self.ones / self.m) ** self.k
+
+        new = False
+        for i in self.__indices__(x):
+            bit = 1 << (i & 7)
+            if not self.bits[i >> 3] & bit:
+                self.bits[i >> 3] |= bit
+                self.ones += 1
+                new = True
+
+        if new:
+            self.size += 1
+
+    def omissionProbability (self):
+        # probability that any of the added objects has been omitted (bounded
+        # by the expected number of omissions)
+        return min(1.0, self.omissions)
+
+def visitedSet (visited, items=()):
+    """
+    Create a visited set.
+
+    Args:
+        visited (str or visited set): ``"exact"`` (:class:`ExactSet`),
+            ``"hashcompact"`` (:class:`HashCompaction`), ``"bitstate"``
+            (:class:`Bitstate`) or an already created visited set
+        items (iterable - optional): objects to add
+
+    Returns:
+        visited set
+    """
+    backends = {
+        "exact": ExactSet,
+        "hashcompact": HashCompaction,
+        "bitstate": Bitstate
+    }
+
+    if isinstance(visited, str):
+        if visited not in backends:
+            raise ValueError("unknown visited set '{}'".format(visited))
+        visited = backends[visited]()
+
+    for x in items:
+        visited.add(x)
+
+    return visited
+
 def __bfs_dfs_aux__ (stack, successors, **kwargs):
     # parse keyword arguments
-    enqueue = kwargs.setdefault("enqueue", lambda x: stack.append(x))
+    enqueue = kwargs.setdefault(
+        "enqueue",
+        stack.push if hasattr(stack, "push") else stack.append
+    )
     dequeue = kwargs["dequeue"]
 
     if "cache" in kwargs:
@@ -11,9 +352,9 @@ def __bfs_dfs_aux__ (stack, successors, **kwargs):
     else:
         if "cached" in kwargs:
             raise ValueError("missing 'cache' argument")
-        __cache = set(stack)
-        cache = lambda x: __cache.add(x)
-        cached = lambda x: x in __cache
+        __cache = visitedSet(kwargs.get("visited", "exact"), stack)
+        cache = __cache.add
+        cached = __cache.__contains__
 
     if "quit" in kwargs:
         quit = kwargs["quit"]
@@ -56,8 +397,14 @@ def bfs (queue, successors, **kwargs):
     * (optional) a function checking if a given object has been cached already
     * (optional) a function for stopping the search
 
+    The search queue can be a list (dequeued in FIFO order in O(1) without
+    shifting the list), a :class:`collections.deque` or any frontier
+    implementing ``push``/``pop`` (e.g. :class:`Queue` or
+    :class:`PriorityQueue` for best-first search), which determines the order
+    objects are expanded in.
+
     Args:
-        queue (list): initial state of the search queue
+        queue (list, deque or frontier): initial state of the search queue
         successors (function): function ``f: object -> list(object)`` returning
             the list of successors to a given object
 
@@ -68,12 +415,26 @@ def bfs (queue, successors, **kwargs):
             to the cache (requires **cached**)
         cached (function): a function ``f: object -> bool`` checking if a given
             object has been cached already (requires **cache**)
+        visited (str or visited set): the default cache, if no **cache** is
+            given (see :func:`visitedSet`)
         quit (function): a function ``f: object -> bool`` returning ``True`` if
             the search should stop with the given object
     """
-    kwargs["dequeue"] = lambda s: s.pop(0)
+    if isinstance(queue, list):
+        queue = __ListQueue__(queue)
+        kwargs["dequeue"] = lambda s: s.pop()
+
+        try:
+            __bfs_dfs_aux__(queue, successors, **kwargs)
+        finally:
+            queue.compact()
+    else:
+        if isinstance(queue, deque):
+            kwargs["dequeue"] = lambda s: s.popleft()
+        else:
+            kwargs["dequeue"] = lambda s: s.pop()
 
-    __bfs_dfs_aux__(queue, successors, **kwargs)
+        __bfs_dfs_aux__(queue, successors, **kwargs)
 
 def dfs (stack, successors, **kwargs):
     """
@@ -100,21 +461,298 @@ def dfs (stack, successors, **kwargs):
     * (optional) a function checking if a given object has been cached already
     * (optional) a function for stopping the search
 
+    The search stack can be a list, a :class:`collections.deque` or any
+    frontier implementing ``push``/``pop`` (e.g. a bounded :class:`Stack` for
+    iterative deepening).
+
     Args:
-        queue (list): initial state of the search queue
+        stack (list, deque or frontier): initial state of the search stack
         successors (function): function ``f: object -> list(object)`` returning
             the list of successors to a given object
 
     Keyword Args:
         enqueue (function): a function ``f: object -> None`` adding objects to
-            the search queue
+            the search stack
         cache (function): a function ``f: object -> None`` adding a given object
             to the cache (requires **cached**)
         cached (function): a function ``f: object -> bool`` checking if a given
             object has been cached already (requires **cache**)
+        visited (str or visited set): the default cache, if no **cache** is
+            given (see :func:`visitedSet`)
         quit (function): a function ``f: object -> bool`` returning ``True`` if
             the search should stop with the given object
     """
     kwargs["dequeue"] = lambda s: s.pop()
 
     __bfs_dfs_aux__(stack, successors, **kwargs)
+
+# state of a parallelBfs worker process: successor function and the visited
+# states owned by the worker
+__parallel__ = {}
+
+def __parallel_init__ (successors):
+    __parallel__["successors"] = successors
+    __parallel__["visited"] = set()
+
+def __parallel_expand__ (states):
+    successors = __parallel__["successors"]
+    visited = __parallel__["visited"]
+
+    # drop states visited already
+    new = [ s for s in states if s not in visited ]
+    visited.update(new)
+
+    # expand new states
+    return len(new), [ t for s in new for t in successors(s) ]
+
+def __parallel_visited__ ():
+    return __parallel__["visited"]
+
+def parallelBfs (initial, successors, workers=None):
+    """
+    Level-synchronous parallel breadth-first search.
+
+    The set of visited objects is partitioned among **workers** processes by
+    hash. Each BFS level is expanded in chunks, one per worker: the worker
+    owning an object checks whether it has been visited already and, if not,
+    computes its successors, which are then routed to their owners for the
+    next level.
+
+    Args:
+        initial (iterable): initial objects
+        successors (function): function ``f: object -> list(object)`` returning
+            the list of successors to a given object (must be picklable, i.e.
+            defined at the top level of a module)
+        workers (int - optional): number of worker processes (default: number
+            of CPUs)
+
+    Returns:
+        tuple: ``(visited, levels)`` - the set of visited objects and the list
+        of frontier sizes (number of new objects per level)
+    """
+    if workers is None:
+        workers = cpu_count() or 1
+
+    if workers < 1:
+        raise ValueError("workers must be positive")
+
+    # route objects to their owner (hashed in this process only, since string
+    # hashes may differ among processes)
+    def route (states):
+        chunks = [ set() for w in range(workers) ]
+        for s in states:
+            chunks[hash(s) % workers].add(s)
+        return chunks
+
+    # one single process pool per worker, owning a partition of the visited set
+    pools = [
+        ProcessPoolExecutor(1, initializer=__parallel_init__, initargs=(successors,))
+        for w in range(workers)
+    ]
+
+    try:
+        levels = []
+        chunks = route(initial)
+
+        while any(chunks):
+            futures = [
+                pool.submit(__parallel_expand__, chunk)
+                for pool, chunk in zip(pools, chunks)
+            ]
+
+            # size of the current level and successors forming the next one
+            size = 0
+            frontier = []
+            for future in futures:
+                new, states = future.result()
+                size += new
+                frontier.extend(states)
+
+            if not size:
+                break
+
+            levels.append(size)
+            chunks = route(frontier)
+
+        visited = set()
+        for pool in pools:
+            visited.update(pool.submit(__parallel_visited__).result())
+
+        return visited, levels
+
+    finally:
+        for pool in pools:
+            pool.shutdown()
+
+# run files: records of serialized objects, prefixed by their length
+__RECORD__ = struct.Struct(">I")
+
+def __encode__ (x):
+    # canonical serialization (unlike pickle, which memoizes shared objects)
+    return repr(x).encode()
+
+def __decode__ (record):
+    return literal_eval(record.decode())
+
+def __write_run__ (path, records):
+    # write atomically, i.e. files are either complete or missing
+    with open(path + ".tmp", "wb") as f:
+        n = 0
+        for record in records:
+            f.write(__RECORD__.pack(len(record)))
+            f.write(record)
+            n += 1
+    os.replace(path + ".tmp", path)
+    return n
+
+def __read_run__ (path):
+    with open(path, "rb") as f:
+        while True:
+            header = f.read(__RECORD__.size)
+            if not header:
+                return
+            yield f.read(__RECORD__.unpack(header)[0])
+
+def __unique__ (records):
+    # remove duplicates from a sorted stream
+    last = None
+    for record in records:
+        if record != last:
+            yield record
+            last = record
+
+def __difference__ (records, visited):
+    # remove visited records from a sorted stream (visited is sorted too)
+    visited = iter(visited)
+    current = next(visited, None)
+    for record in records:
+        while current is not None and current < record:
+            current = next(visited, None)
+        if record != current:
+            yield record
+
+def externalBfs (initial, successors, directory, **kwargs):
+    """
+    External memory breadth-first search (delayed duplicate detection).
+
+    Every BFS level is stored in a sorted run file of serialized objects.
+    Successors of a level are collected in memory buffers of at most
+    **buffer** objects, which are sorted and written to temporary run files.
+    The runs are then merged and compared against the sorted file of visited
+    objects in a single streaming merge, yielding the next level, i.e. memory
+    usage is bounded by the buffer size.
+
+    The search progress is recorded in **directory** after every level, an
+    interrupted search is resumed by calling :func:`externalBfs` with the
+    same directory again.
+
+    Args:
+        initial (iterable): initial objects
+        successors (function): function ``f: object -> list(object)`` returning
+            the list of successors to a given object
+        directory (str): directory for storing the run files
+
+    Keyword Args:
+        buffer (int): maximum number of objects kept in memory (default:
+            2^20)
+        encode (function): a function ``f: object -> bytes`` serializing
+            objects, equal objects must be mapped to equal bytes (default:
+            the object's ``repr``, which therefore has to be canonical and a
+            Python literal, e.g. numbers, strings and tuples thereof, but
+            not sets or dicts)
+        decode (function): a function ``f: bytes -> object`` restoring
+            serialized objects (default: :func:`ast.literal_eval` of the
+            ``repr``)
+        visit (function): a function ``f: object -> None`` called for every
+            visited object (once per level, i.e. not again for levels
+            visited before resuming)
+
+    Returns:
+        list: frontier sizes (number of new objects per level)
+    """
+    # parse keyword arguments
+    buffer = kwargs.get("buffer", 1 << 20)
+    encode = kwargs.get("encode", __encode__)
+    decode = kwargs.get("decode", __decode__)
+    visit = kwargs.get("visit", None)
+
+    os.makedirs(directory, exist_ok=True)
+
+    path = lambda name: os.path.join(directory, name)
+    checkpoint = path("checkpoint")
+
+    def save (levels, done):
+        with open(checkpoint + ".tmp", "w") as f:
+            json.dump({ "levels": levels, "done": done }, f)
+        os.replace(checkpoint + ".tmp", checkpoint)
+
+    def visitRun (records):
+        for record in records:
+            if visit is not None:
+                visit(decode(record))
+            yield record
+
+    # resume or initialize search
+    if os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            progress = json.load(f)
+
+        levels = progress["levels"]
+        if progress["done"]:
+            return levels[:-1]
+
+        # remove files of an interrupted level
+        d = len(levels) - 1
+        for name in os.listdir(directory):
+            if name.startswith(("level-", "visited-", "run-")) \
+                    and name not in ("level-{}".format(d), "visited-{}".format(d)):
+                os.remove(path(name))
+    else:
+        records = __unique__(sorted(encode(x) for x in initial))
+        levels = [ __write_run__(path("level-0"), visitRun(records)) ]
+        __write_run__(path("visited-0"), __read_run__(path("level-0")))
+        save(levels, not levels[0])
+
+    while levels[-1]:
+        d = len(levels) - 1
+
+        # expand current level into sorted runs
+        runs = []
+
+        def flush (records):
+            runs.append(path("run-{}".format(len(runs))))
+            __write_run__(runs[-1], __unique__(sorted(records)))
+
+        records = []
+        for record in __read_run__(path("level-{}".format(d))):
+            for successor in successors(decode(record)):
+                records.append(encode(successor))
+                if len(records) >= buffer:
+                    flush(records)
+                    records = []
+
+        if records or not runs:
+            flush(records)
+
+        # merge runs and remove visited objects
+        level = path("level-{}".format(d + 1))
+        visited = path("visited-{}".format(d))
+        records = __unique__(merge(*[ __read_run__(r) for r in runs ]))
+        records = __difference__(records, __read_run__(visited))
+        levels.append(__write_run__(level, visitRun(records)))
+
+        # merge next level into visited objects
+        __write_run__(
+            path("visited-{}".format(d + 1)),
+            merge(__read_run__(visited), __read_run__(level))
+        )
+
+        save(levels, not levels[-1])
+
+        # remove files of the previous level
+        for r in runs:
+            os.remove(r)
+        os.remove(visited)
+        os.remove(path("level-{}".format(d)))
+
+    return levels[:-1]
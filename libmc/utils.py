@@ -0,0 +1,8 @@
+def hashable (s):
+    """Returns a hashable key for a given state (lists become tuples)."""
+    try:
+        hash(s)
+        return s
+    except TypeError:
+        key = tuple(hashable(x) for x in s)
+        return key if isinstance(s, tuple) else (list,) + key
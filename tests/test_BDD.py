@@ -106,3 +106,124 @@ class TestBDD (unittest.TestCase):
                 BDD(0, True, [BDD(-1, False), BDD(-1, True)])
             ])
         )
+
+    def test_computed_table (self):
+        table = BDD.computedTable()
+        table.clear()
+
+        a = BDD(0) | BDD(1)
+        b = BDD(2) ^ BDD(1)
+
+        c = a & b
+        misses = table.misses
+
+        # commutative operands share an entry
+        self.assertIs(b & a, c)
+        self.assertEqual(table.misses, misses)
+        self.assertGreater(table.hits, 0)
+
+        # XOR of 16 variables is linear in size instead of exponential
+        f = BDD.false()
+        for i in range(16):
+            f = f ^ BDD(i)
+        self.assertLess(table.misses, 1000)
+
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.hits, 0)
+
+    def test_manager (self):
+        manager = BDD.true().manager
+
+        # equal functions share a node, complements share it as well
+        a = BDD(3) & BDD(4)
+        self.assertIs(BDD(4) & BDD(3), a)
+        self.assertIs(~~a, a)
+        self.assertEqual((~a).handle, a.handle ^ 1)
+        self.assertEqual(~a, ~BDD(3) | ~BDD(4))
+
+        # unreferenced nodes are freed
+        manager.collect()
+        nodes = len(manager)
+
+        f = BDD.false()
+        for i in range(5, 15):
+            f = f ^ BDD(i)
+        self.assertGreater(len(manager), nodes)
+
+        del f
+        manager.collect()
+        self.assertEqual(len(manager), nodes)
+        self.assertIs(BDD(4) & BDD(3), a)
+
+    def test_quantification (self):
+        x, y, z = BDD(0), BDD(1), BDD(2)
+        f = (x & y) | z
+
+        self.assertEqual(f.exists([ 0 ]), y | z)
+        self.assertEqual(f.exists([ 0, 1, 2 ]), BDD.true())
+        self.assertEqual(f.forall([ 0 ]), z)
+        self.assertEqual(f.forall([ 2 ]), x & y)
+        self.assertEqual(f.exists([]), f)
+
+        g = ~x | ~z
+        self.assertEqual(f.andExists(g, [ 0, 2 ]), (f & g).exists([ 0, 2 ]))
+        self.assertEqual(f.andExists(g, [ 0 ]), y & ~z | z)
+        self.assertEqual(f.andExists(~f, [ 1 ]), BDD.false())
+
+    def test_substitution (self):
+        x, y, z = BDD(0), BDD(1), BDD(2)
+        f = (x & y) | z
+
+        self.assertEqual(f.restrict({ 2: False }), x & y)
+        self.assertEqual(f.restrict({ 0: True, 2: False }), y)
+        self.assertEqual(f.restrict({ 2: True }), BDD.true())
+
+        self.assertEqual(f.compose(1, x ^ z), (x & ~z) | z)
+        self.assertEqual(f.compose(2, BDD.false()), x & y)
+
+        # order preserving and reversing renaming
+        self.assertEqual(f.rename({ 0: 3, 1: 4, 2: 5 }), (BDD(3) & BDD(4)) | BDD(5))
+        self.assertEqual(f.rename({ 0: 2, 2: 0 }), (z & y) | x)
+
+    def test_reordering (self):
+        manager = BDD.true().manager
+        order = BDD.order()
+        self.addCleanup(BDD.setOrder, order)
+
+        # x_i ∧ y_i pairs are far apart in the initial order
+        k = 6
+        pairs = [ (BDD(200 + i), BDD(200 + k + i)) for i in range(k) ]
+        f = BDD.false()
+        for x, y in pairs:
+            f = f | (x & y)
+        g = pairs[0][0] ^ pairs[-1][1]
+
+        initial = BDD.order()
+        manager.collect()
+        nodes = len(manager)
+
+        for method in ("sifting", "window"):
+            BDD.setOrder(initial)
+            self.assertEqual(len(manager), nodes)
+
+            # functions (and BDD objects) are kept
+            self.assertLess(BDD.reorder(method), nodes)
+            self.assertIs(pairs[-1][1] ^ pairs[0][0], g)
+            h = BDD.false()
+            for x, y in reversed(pairs):
+                h = h | (y & x)
+            self.assertIs(h, f)
+            self.assertEqual(f.exists([ 200 + k ]), f.restrict({ 200 + k: True }))
+
+        # the order found can be restored
+        best = BDD.order()
+        manager.collect()
+        reduced = len(manager)
+        BDD.setOrder(initial)
+        BDD.setOrder(best)
+        self.assertEqual(BDD.order(), best)
+        self.assertEqual(len(manager), reduced)
+
+        with self.assertRaises(ValueError):
+            BDD.reorder("unknown")
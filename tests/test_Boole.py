@@ -90,6 +90,53 @@ class TestBoole (unittest.TestCase):
             BDD.false()
         )
 
+    def test_order (self):
+        formula = Boole("a0 & b0 | a1 & b1 | a2 & b2 | a3 & b3")
+
+        self.assertEqual(formula.order("sorted"), formula.variables)
+        self.assertEqual(
+            formula.order("dfs"),
+            [ "b3", "a3", "b2", "a2", "b1", "a1", "b0", "a0" ]
+        )
+        self.assertEqual(formula.order("fanin"), formula.order("dfs"))
+        self.assertEqual(
+            Boole("(a & b) | c").order("fanin"),
+            [ "b", "a", "c" ]
+        )
+        with self.assertRaises(ValueError):
+            formula.order("unknown")
+
+        def size (bdd):
+            nodes = set()
+            stack = [ bdd ]
+            while stack:
+                bdd = stack.pop()
+                if bdd.handle >> 1 not in nodes:
+                    nodes.add(bdd.handle >> 1)
+                    if not bdd.isConstant():
+                        stack.extend(bdd.child)
+            return len(nodes)
+
+        # same function, renamed variables, fewer nodes
+        default = formula.toBDD()
+        self.assertIs(formula.toBDD(formula.variables), default)
+
+        for heuristic in ("dfs", "force", "fanin"):
+            order = formula.order(heuristic)
+            bdd = formula.toBDD(heuristic)
+            self.assertIs(formula.toBDD(order), bdd)
+            self.assertIs(
+                default.rename({
+                    i: order.index(v)
+                    for i, v in enumerate(formula.variables)
+                }),
+                bdd
+            )
+            self.assertLess(size(bdd), size(default))
+
+        with self.assertRaises(ValueError):
+            formula.toBDD([ "a0", "b0" ])
+
     def test_toAIG (self):
         self.assertEqual(
             Boole("a & b").toAIG(),
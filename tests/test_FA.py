@@ -363,6 +363,32 @@ class TestFA (unittest.TestCase):
             "FA.power: final states"
         )
 
+    # subset construction is performed on-the-fly (instead of 2^32 subsets)
+    def test_power_on_the_fly (self):
+        F = FA (
+            S = list(range(32)),
+            I = [0],
+            Σ = ['a', 'b'],
+            T = [ (0, 'b', 1), (0, 'b', 2) ] + \
+                [ (i, 'a', i + 1) for i in range(31) ],
+            F = [31]
+        )
+
+        P = F.power()
+
+        self.assertEqual(
+            P.S,
+            sorted(
+                [[]] +
+                [ [i] for i in range(32) ] +
+                [ [i, i + 1] for i in range(1, 31) ]
+            ),
+            "FA.power: states"
+        )
+        self.assertEqual(P.I, [[0]], "FA.power: initial states")
+        self.assertEqual(P.F, [[30, 31], [31]], "FA.power: final states")
+        self.assertTrue(P.isDeterministic(), "FA.power: isDeterministic")
+
     ############################################################################
     # acceptance
     ############################################################################
@@ -385,6 +411,22 @@ class TestFA (unittest.TestCase):
         self.assertEqual(F.accepts("abb"), True, "FA.accepts")
         self.assertEqual(F.accepts("aabb"), True, "FA.accepts")
         self.assertEqual(F.accepts("ab"), False, "FA.accepts")
+        self.assertEqual(F.accepts(""), False, "FA.accepts")
+        self.assertEqual(F.accepts("abc"), False, "FA.accepts")
+
+        self.assertEqual(
+            F.acceptsMany(["abb", "aabb", "ab", "babb", ["a", "b", "b"]]),
+            [True, True, False, True, True],
+            "FA.acceptsMany"
+        )
+
+        # announced in-place modifications are reflected: (a|b)*abb*
+        F.T[4] = (3, 'b', 3)
+        F.F[0] = 3
+        F.modified()
+        self.assertEqual(F.accepts("ab"), True, "FA.accepts")
+        self.assertEqual(F.accepts("abbb"), True, "FA.accepts")
+        self.assertEqual(F.accepts("aba"), False, "FA.accepts")
 
     ############################################################################
     # conformance
@@ -444,6 +486,64 @@ class TestFA (unittest.TestCase):
             "FA.conforms: traces"
         )
 
+    def test_conformance_antichain (self):
+        [ conforms, ICPS, traces ] = self.I_EX1.conforms(self.S_EX1, antichain=True)
+
+        self.assertEqual(conforms, True, "FA.conforms: conforms")
+        self.assertEqual(ICPS, None, "FA.conforms: checker")
+        self.assertEqual(traces, [], "FA.conforms: traces")
+
+        # shortest counterexample: b
+        I = FA(
+            S = [1, 2, 3, 4],
+            I = [1],
+            Σ = ['a', 'b'],
+            T = [
+                (1, 'a', 2),
+                (2, 'a', 3),
+                (3, 'b', 4),
+                (1, 'b', 4),
+            ],
+            F = [4]
+        )
+
+        S = FA(
+            S = ['A', 'B', 'C'],
+            I = ['A'],
+            Σ = ['a', 'b'],
+            T = [
+                ('A', 'a', 'B'),
+                ('B', 'a', 'B'),
+                ('B', 'b', 'C'),
+            ],
+            F = ['C']
+        )
+
+        [ conforms, ICPS, traces ] = I.conforms(S, antichain=True)
+
+        self.assertEqual(conforms, False, "FA.conforms: conforms")
+        self.assertEqual(
+            traces,
+            [[((1, ['A']), 'b', (4, []))]],
+            "FA.conforms: traces"
+        )
+
+    def test_conformance_empty_word (self):
+        # languages only differ on the empty word
+        I = FA([1, 2], [1], ['a'], [(1, 'a', 2)], [1, 2])
+        S = FA(['A', 'B'], ['A'], ['a'], [('A', 'a', 'B')], ['B'])
+
+        conforms, ICPS, traces = I.conforms(S)
+        self.assertEqual(conforms, False, "FA.conforms: conforms")
+        self.assertEqual(traces, [[]], "FA.conforms: traces")
+
+        conforms, ICPS, traces = I.conforms(S, antichain=True)
+        self.assertEqual(conforms, False, "FA.conforms: conforms")
+        self.assertEqual(traces, [[]], "FA.conforms: traces")
+
+        self.assertEqual(S.conforms(I)[0], True, "FA.conforms: conforms")
+        self.assertEqual(S.conforms(I, antichain=True)[0], True, "FA.conforms: conforms")
+
     def test_conformance (self):
         [ conforms, ICPS, traces ] = self.I_EX1.conforms(self.S_EX1)
 
@@ -743,3 +843,76 @@ class TestFA (unittest.TestCase):
             [('B', 'F')],
             "minimize: final states"
         )
+
+    def test_compact (self):
+        F = FA (
+            S = ['A', 'B', 'C', 'D', 'E', 'F'],
+            I = ['A'],
+            Σ = [0, 1],
+            T = [
+                    ('A', 0, 'B'),
+                    ('A', 1, 'E'),
+                    ('B', 0, 'A'),
+                    ('B', 1, 'C'),
+                    ('C', 0, 'A'),
+                    ('C', 1, 'C'),
+                    ('D', 0, 'F'),
+                    ('D', 1, 'C'),
+                    ('E', 0, 'D'),
+                    ('E', 1, 'E'),
+                    ('F', 0, 'A'),
+                    ('F', 1, 'E')
+                ],
+            F = ['B', 'F']
+        )
+
+        C = F.compact()
+
+        self.assertEqual(C.F, [1, 5], "CompactFA: final states")
+        self.assertEqual(
+            C.acceptsMany([[0], [0, 1], [1, 0, 0]]),
+            F.acceptsMany([[0], [0, 1], [1, 0, 0]]),
+            "CompactFA.acceptsMany"
+        )
+        self.assertEqual(
+            C.minimize().S,
+            [(0, 3), (1, 5), (2, 4)],
+            "CompactFA.minimize: states"
+        )
+
+        E = C.expand()
+        self.assertIsInstance(E, FA, "CompactFA.expand")
+        self.assertEqual(E.F, F.F, "CompactFA.expand: final states")
+        self.assertEqual(E.T, F.T, "CompactFA.expand: transitions")
+
+    # partial automaton containing a falsy state
+    def test_minimize_partial (self):
+        F = FA (
+            S = [0, 1, 2, 3],
+            I = [0],
+            Σ = ['a', 'b'],
+            T = [
+                    (0, 'a', 1),
+                    (1, 'b', 0),
+                    (2, 'a', 3),
+                    (3, 'b', 2),
+                    (3, 'a', 3)
+                ],
+            F = [1, 3]
+        )
+
+        F = F.minimize()
+
+        self.assertEqual(F.S, [(0,), (1,), (2,), (3,)], "minimize: states")
+        self.assertEqual(
+            F.T,
+            [
+                ((0,), 'a', (1,)),
+                ((1,), 'b', (0,)),
+                ((2,), 'a', (3,)),
+                ((3,), 'b', (2,)),
+                ((3,), 'a', (3,))
+            ],
+            "minimize: transitions"
+        )
+        self.assertEqual(F.F, [(1,), (3,)], "minimize: final states")
@@ -1,6 +1,6 @@
 import unittest
 
-from libmc import LTS
+from libmc import LTS, tarjan
 
 class TestLTS (unittest.TestCase):
 
@@ -93,3 +93,137 @@ class TestLTS (unittest.TestCase):
             [[(2, 'b', 3)], [(2, 'a', 2), (2, 'b', 3)]],
             "LTS.traces"
         )
+
+    ############################################################################
+    # weak transition relation
+    ############################################################################
+    def test_saturate (self):
+        L = LTS (
+            S = [1, 2, 3, 4],
+            I = [1],
+            Σ = ['a', 'b', 'τ'],
+            T = [
+                    (1, 'τ', 2),
+                    (2, 'τ', 1), # τ-cycle
+                    (2, 'a', 3),
+                    (3, 'τ', 4),
+                    (4, 'b', 4)
+                ]
+        )
+
+        W = L.saturate(['τ'])
+
+        self.assertEqual(W.S, L.S, "LTS.saturate: states")
+        self.assertEqual(W.I, L.I, "LTS.saturate: initial states")
+        self.assertEqual(W.Σ, ['a', 'b'], "LTS.saturate: alphabet")
+        self.assertEqual(
+            sorted(W.T),
+            [
+                (1, 'a', 3),
+                (2, 'a', 3),
+                (3, 'b', 4),
+                (4, 'b', 4)
+            ],
+            "LTS.saturate: transitions"
+        )
+
+    ############################################################################
+    # adjacency index
+    ############################################################################
+    def test_index (self):
+        L = LTS (
+            S = [1, 2, 3],
+            I = [1],
+            Σ = ['a', 'b'],
+            T = [
+                    (1, 'a', 2),
+                    (1, 'b', 2),
+                    (1, 'b', 3),
+                    (2, 'b', 3)
+                ]
+        )
+
+        self.assertEqual(L.successors(1), [2, 3], "LTS.successors")
+        self.assertEqual(L.successors(1, 'b'), [2, 3], "LTS.successors")
+        self.assertEqual(L.successors(3), [], "LTS.successors")
+        self.assertEqual(L.predecessors(3), [1, 2], "LTS.predecessors")
+        self.assertEqual(L.predecessors(2), [1], "LTS.predecessors")
+        self.assertEqual(L.predecessors(2, 'a'), [1], "LTS.predecessors")
+        self.assertEqual(
+            L.outgoing(1),
+            [(1, 'a', 2), (1, 'b', 2), (1, 'b', 3)],
+            "LTS.outgoing"
+        )
+
+        # in-place modifications are announced explicitly
+        L.T.append((3, 'a', 1))
+        L.modified()
+        self.assertEqual(L.successors(3, 'a'), [1], "LTS.successors")
+
+        # reassigning transitions invalidates the index
+        L.T = [ (2, 'a', 1) ]
+        self.assertEqual(L.successors(1), [], "LTS.successors")
+        self.assertEqual(L.predecessors(1, 'a'), [2], "LTS.predecessors")
+
+        L.T[0] = (1, 'a', 3)
+        L.modified()
+        self.assertEqual(L.successors(1, 'a'), [3], "LTS.successors")
+        self.assertEqual(L.predecessors(1), [], "LTS.predecessors")
+
+        del L.T[:]
+        L.modified()
+        self.assertEqual(L.successors(1), [], "LTS.successors")
+
+        # assigned lists are not copied
+        T = [ (1, 'a', 2) ]
+        L.T = T
+        self.assertIs(L.T, T, "LTS.T")
+        self.assertIs(LTS([1], [1], ['a'], T).T, T, "LTS.T")
+
+        # returned lists are copies
+        L.successors(1, 'a').append(3)
+        L.outgoing(1).clear()
+        self.assertEqual(L.successors(1, 'a'), [2], "LTS.successors")
+        self.assertEqual(L.outgoing(1), [(1, 'a', 2)], "LTS.outgoing")
+
+    def test_compact (self):
+        L = LTS (
+            S = ['x', 'y', 'z'],
+            I = ['x'],
+            Σ = ['b', 'a'],
+            T = [
+                    ('y', 'b', 'z'),
+                    ('x', 'b', 'z'),
+                    ('x', 'a', 'y'),
+                    ('x', 'b', 'y'),
+                    ('z', 'a', 'y')
+                ]
+        )
+
+        C = L.compact()
+
+        self.assertEqual(list(C.S), [0, 1, 2], "CompactLTS: states")
+        self.assertEqual(C.I, [0], "CompactLTS: initial states")
+        self.assertEqual(C.Σ, [0, 1], "CompactLTS: alphabet")
+        self.assertEqual(
+            C.T,
+            [(0, 0, 1), (0, 0, 2), (0, 1, 1), (1, 0, 2), (2, 1, 1)],
+            "CompactLTS: transitions"
+        )
+        self.assertEqual(C.T[3], (1, 0, 2), "CompactLTS: transition")
+        self.assertEqual(C.successors(0), [1, 2, 1], "CompactLTS.successors")
+        self.assertEqual(C.successors(0, 0), [1, 2], "CompactLTS.successors")
+        self.assertEqual(C.predecessors(1), [0, 0, 2], "CompactLTS.predecessors")
+        self.assertEqual(C.predecessors(2, 0), [0, 1], "CompactLTS.predecessors")
+        self.assertEqual(C.outgoing(2), [(2, 1, 1)], "CompactLTS.outgoing")
+
+        # algorithms operate on the compact representation
+        self.assertTrue(C.bisimulates(L.compact()), "CompactLTS.bisimulates")
+        self.assertEqual(tarjan(C), [[0], [1, 2]], "CompactLTS: tarjan")
+
+        # convert back
+        E = C.expand()
+        self.assertEqual(E.S, L.S, "CompactLTS.expand: states")
+        self.assertEqual(E.I, L.I, "CompactLTS.expand: initial states")
+        self.assertEqual(E.Σ, L.Σ, "CompactLTS.expand: alphabet")
+        self.assertEqual(sorted(E.T), sorted(L.T), "CompactLTS.expand: transitions")
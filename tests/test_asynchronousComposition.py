@@ -1,6 +1,11 @@
 import unittest
 
-from libmc import asynchronousComposition, LTS
+import os
+import pickle
+
+from tempfile import TemporaryDirectory
+
+from libmc import asynchronousComposition, asynchronousCompositionStream, distributedComposition, LTS, symbolicComposition
 
 class TestAsynchronousComposition (unittest.TestCase):
 
@@ -271,3 +276,233 @@ class TestAsynchronousComposition (unittest.TestCase):
             ],
             "partialOrderReduction: transitions"
         )
+
+    # lossy visited sets
+    def test_visited (self):
+        A = LTS (
+            S = list(range(10)),
+            I = [0],
+            Σ = ['a', 's'],
+            T = [ (i, 'a', i + 1) for i in range(9) ] + [ (9, 's', 0) ]
+            )
+
+        B = LTS (
+            S = list(range(10, 20)),
+            I = [10],
+            Σ = ['b', 's'],
+            T = [ (i, 'b', i + 1) for i in range(10, 19) ] + [ (19, 's', 10) ]
+            )
+
+        composition = asynchronousComposition(A, B)
+
+        for visited in [ "hashcompact", "bitstate" ]:
+            lossy = asynchronousComposition(A, B, visited=visited)
+            self.assertEqual(lossy.S, composition.S, visited + ": states")
+            self.assertEqual(lossy.T, composition.T, visited + ": transitions")
+
+    # built-in partial order reduction
+    def test_reduction (self):
+        # independent local steps followed by a synchronization
+        components = [
+            LTS (
+                S = [0, 1, 2, 3],
+                I = [0],
+                Σ = [ a + str(k) for a in 'ab' ] + ['s'],
+                T = [
+                        (0, 'a' + str(k), 1),
+                        (1, 'b' + str(k), 2),
+                        (2, 's', 3)
+                    ]
+                )
+            for k in range(3)
+        ]
+
+        composition = asynchronousComposition(*components)
+        self.assertEqual(len(composition.S), 28, "reduction: full states")
+
+        for reduction in [ "ample", "persistent", "stubborn" ]:
+            reduced = asynchronousComposition(*components, reduction=reduction)
+            self.assertEqual(len(reduced.S), 8, reduction + ": states")
+            self.assertEqual(
+                reduced.T[-1],
+                ((2, 2, 2), 's', (3, 3, 3)),
+                reduction + ": synchronization"
+            )
+
+        with self.assertRaises(ValueError):
+            asynchronousComposition(*components, reduction="unknown")
+
+        with self.assertRaises(ValueError):
+            asynchronousComposition(
+                *components,
+                reduction="ample",
+                partialOrderReduction=lambda x: x
+            )
+
+        # the stream rejects invalid arguments when called, not when iterated
+        with self.assertRaises(ValueError):
+            asynchronousCompositionStream(*components, reduction="unknown")
+
+    # symbolic reachability
+    def test_symbolic (self):
+        A = LTS (
+            S = [1, 2, 3],
+            I = [1],
+            Σ = ['a', 's'],
+            T = [
+                    (1, 'a', 2),
+                    (2, 's', 3),
+                    (3, 'a', 1)
+                ]
+            )
+
+        B = LTS (
+            S = ['x', 'y', 'z', 'u', 'v'],
+            I = ['x'],
+            Σ = ['b', 's'],
+            T = [
+                    ('x', 'b', 'y'),
+                    ('y', 's', 'z'),
+                    ('z', 'b', 'x'),
+                    ('u', 'b', 'v')
+                ]
+            )
+
+        composition = asynchronousComposition(A, B)
+        symbolic = symbolicComposition(A, B)
+
+        self.assertEqual(symbolic.count, len(composition.S), "symbolicComposition: count")
+        self.assertTrue(all(s in symbolic for s in composition.S), "symbolicComposition: reachable")
+        self.assertNotIn((1, 'u'), symbolic, "symbolicComposition: unreachable")
+        self.assertNotIn((1, 'w'), symbolic, "symbolicComposition: unknown state")
+
+        # 2^12 states of 12 independent components
+        C = [
+            LTS([0, 1], [0], [ 'a' + str(i) ], [ (0, 'a' + str(i), 1) ])
+            for i in range(12)
+        ]
+        self.assertEqual(symbolicComposition(*C).count, 2 ** 12, "symbolicComposition: count")
+
+        # 3^20 states of 20 components synchronizing on a shared label
+        C = [
+            LTS(
+                [0, 1, 2],
+                [0],
+                [ 's', 'l' + str(i) ],
+                [ (0, 's', 1), (1, 's', 2), (2, 's', 0), (0, 'l' + str(i), 2) ]
+            )
+            for i in range(20)
+        ]
+        symbolic = symbolicComposition(*C)
+        self.assertEqual(symbolic.count, 3 ** 20, "symbolicComposition: count")
+        self.assertIn((1,) * 20, symbolic, "symbolicComposition: reachable")
+
+    # streaming generation
+    def test_stream (self):
+        A = LTS (
+            S = [1, 2, 3],
+            I = [1],
+            Σ = ['a', 's'],
+            T = [
+                    (1, 'a', 2),
+                    (2, 's', 3),
+                    (3, 'a', 1)
+                ]
+            )
+
+        B = LTS (
+            S = ['x', 'y'],
+            I = ['x'],
+            Σ = ['b', 's'],
+            T = [
+                    ('x', 'b', 'y'),
+                    ('y', 's', 'x')
+                ]
+            )
+
+        composition = asynchronousComposition(A, B)
+        events = list(asynchronousCompositionStream(A, B))
+
+        self.assertEqual(events[0], ("state", (1, 'x')), "stream: initial state")
+        self.assertEqual(
+            sorted(x for kind, x in events if kind == "state"),
+            composition.S,
+            "stream: states"
+        )
+        self.assertEqual(
+            sorted(x for kind, x in events if kind == "transition"),
+            composition.T,
+            "stream: transitions"
+        )
+
+        # states are yielded before their incoming transitions
+        seen = set()
+        for kind, x in events:
+            if kind == "state":
+                seen.add(x)
+            else:
+                self.assertIn(x[2], seen, "stream: discovery order")
+
+        # early stop
+        events = list(asynchronousCompositionStream(
+            A, B, quit=lambda t: t[1] == 's'
+        ))
+        self.assertEqual(events[-1][1][1], 's', "stream: quit")
+        self.assertEqual(
+            sum(kind == "transition" and x[1] == 's' for kind, x in events),
+            1,
+            "stream: quit"
+        )
+
+        # unsorted composition
+        unsorted = asynchronousComposition(A, B, sort=False)
+        self.assertEqual(sorted(unsorted.S), composition.S, "sort: states")
+        self.assertEqual(sorted(unsorted.T), composition.T, "sort: transitions")
+
+    # distributed generation
+    def test_distributed (self):
+        A = LTS (
+            S = [1, 2, 3],
+            I = [1],
+            Σ = ['a', 's'],
+            T = [
+                    (1, 'a', 2),
+                    (2, 's', 3),
+                    (3, 'a', 1)
+                ]
+            )
+
+        B = LTS (
+            S = ['x', 'y', 'z'],
+            I = ['x', 'z'],
+            Σ = ['b', 's'],
+            T = [
+                    ('x', 'b', 'y'),
+                    ('y', 's', 'x'),
+                    ('z', 'b', 'x')
+                ]
+            )
+
+        composition = asynchronousComposition(A, B)
+
+        for workers in [ 1, 3 ]:
+            distributed = distributedComposition(A, B, workers=workers, batch=2)
+            self.assertEqual(distributed.S, composition.S, "distributed: states")
+            self.assertEqual(distributed.I, composition.I, "distributed: initial states")
+            self.assertEqual(distributed.T, composition.T, "distributed: transitions")
+
+        # per-partition transition files
+        with TemporaryDirectory() as directory:
+            paths = distributedComposition(A, B, workers=2, directory=directory)
+            self.assertEqual(
+                [ os.path.basename(path) for path in paths ],
+                [ "partition-0", "partition-1" ],
+                "distributed: partition files"
+            )
+
+            T = []
+            for path in paths:
+                with open(path, "rb") as f:
+                    T.extend(pickle.load(f)[1])
+
+            self.assertEqual(sorted(T), composition.T, "distributed: partitioned transitions")
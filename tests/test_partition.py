@@ -0,0 +1,87 @@
+import unittest
+
+from libmc import hopcroft, paigeTarjan
+
+class TestPartition (unittest.TestCase):
+
+    # nondeterministic version of Milner's vending machine
+    #
+    # coarsest stable partition
+    # * [1]
+    # * [2]
+    # * [3]
+    # * [4, 5]
+    def test_paigeTarjan (self):
+        S = [1, 2, 3, 4, 5]
+        T = [
+                (1, 'p', 2),
+                (1, 'p', 3),
+                (2, 'd', 4),
+                (3, 'm', 5)
+            ]
+
+        self.assertEqual(
+            paigeTarjan(S, T),
+            [[1], [2], [3], [4, 5]],
+            "paigeTarjan: partition"
+        )
+
+    # all states of a cycle are bisimilar unless separated by the initial
+    # partition
+    def test_paigeTarjan_initial_partition (self):
+        S = [1, 2, 3, 4]
+        T = [
+                (1, 'a', 2),
+                (2, 'a', 3),
+                (3, 'a', 4),
+                (4, 'a', 1)
+            ]
+
+        self.assertEqual(paigeTarjan(S, T), [[1, 2, 3, 4]])
+        self.assertEqual(
+            paigeTarjan(S, T, [[1, 3], [2, 4]]),
+            [[1, 3], [2, 4]],
+            "paigeTarjan: partition"
+        )
+        self.assertEqual(
+            paigeTarjan(S, T, [[1], [2, 3, 4]]),
+            [[1], [2], [3], [4]],
+            "paigeTarjan: partition"
+        )
+
+        with self.assertRaises(ValueError):
+            paigeTarjan(S, T, [[1, 2]])
+
+    # partial deterministic automaton
+    #
+    # coarsest compatible partition
+    # * [1, 3]
+    # * [2, 4]
+    # * [5] missing transition
+    # * [6]
+    def test_hopcroft (self):
+        S = [1, 2, 3, 4, 5, 6]
+        T = [
+                (1, 'a', 2),
+                (2, 'a', 3),
+                (3, 'a', 4),
+                (4, 'a', 1),
+                (5, 'a', 6),
+                (5, 'b', 6),
+                (6, 'a', 5),
+                (1, 'b', 6),
+                (2, 'b', 5),
+                (3, 'b', 6),
+                (4, 'b', 5)
+            ]
+
+        self.assertEqual(
+            hopcroft(S, T, [[1, 2, 3, 4, 5], [6]]),
+            [[1, 3], [2, 4], [5], [6]],
+            "hopcroft: partition"
+        )
+        self.assertEqual(
+            hopcroft(S, T, [[1, 2, 3, 4, 5], [6]]),
+            paigeTarjan(S, T, [[1, 2, 3, 4, 5], [6]]),
+            "hopcroft: partition"
+        )
@@ -2,7 +2,7 @@ import unittest
 
 from itertools import product
 
-from libmc import LTS, maximumSimulation, maximumBisimulation
+from libmc import LTS, branchingBisimulation, hhk, maximumSimulation, maximumBisimulation
 
 class TestSimulation (unittest.TestCase):
 
@@ -109,6 +109,40 @@ class TestSimulation (unittest.TestCase):
             print("=" * 80)
             raise
 
+    # counter based refinement with a partial starting relation
+    def test_hhk (self):
+        S1 = [1, 2, 3]
+        T1 = [
+                (1, 'a', 2),
+                (2, 'b', 3)
+            ]
+
+        S2 = [4, 5, 6, 7]
+        T2 = [
+                (4, 'a', 5),
+                (4, 'a', 6),
+                (5, 'b', 7)
+            ]
+
+        self.assertEqual(
+            hhk(S1, T1, S2, T2, set(product(S1, S2))),
+            {
+                (1, 4),
+                (2, 5),
+                (3, 4), (3, 5), (3, 6), (3, 7)
+            },
+            "hhk: simulation relation"
+        )
+
+        # 1 ≲ 4 requires 2 ≲ 5
+        self.assertEqual(
+            hhk(S1, T1, S2, T2, set(product(S1, S2)) - { (2, 5) }),
+            {
+                (3, 4), (3, 5), (3, 6), (3, 7)
+            },
+            "hhk: simulation relation"
+        )
+
     ############################################################################
     # weak simulation
     #
@@ -317,3 +351,123 @@ class TestSimulation (unittest.TestCase):
             printRelation(simulation, A_VO.S + B_VO.S, A_VO.S + B_VO.S)
             print("=" * 80)
             raise
+
+    def test_bisimulation_orientation (self):
+        # greatest fixpoint of the forth and back conditions (without τ)
+        def bisimulation (A1, A2, R):
+            while True:
+                _R = {
+                    (s, t) for (s, t) in R
+                    if all(
+                        any(
+                            (_s, _t) in R
+                            for (__t, b, _t) in A2.T if __t == t and b == a
+                        )
+                        for (__s, a, _s) in A1.T if __s == s
+                    )
+                    and all(
+                        any(
+                            (_s, _t) in R
+                            for (__s, b, _s) in A1.T if __s == s and b == a
+                        )
+                        for (__t, a, _t) in A2.T if __t == t
+                    )
+                }
+                if _R == R:
+                    return { (t, s) for (s, t) in R }
+                R = _R
+
+        A = LTS([0, 1], [0], ['a'], [(0, 'a', 1)])
+        B = LTS(
+            ['x', 'y', 'z'],
+            ['x'],
+            ['a'],
+            [('x', 'a', 'y'), ('y', 'a', 'z')]
+        )
+
+        full = set(product(A.S, B.S))
+        partial = full - { (1, 'y') }
+
+        for R0 in (full, partial):
+            self.assertEqual(
+                maximumBisimulation(A, B, R0),
+                bisimulation(A, B, R0),
+                "maximumBisimulation: orientation"
+            )
+
+        self.assertIn(('z', 1), maximumBisimulation(A, B, full))
+        self.assertIn(('z', 1), maximumBisimulation(A, B, partial))
+
+        # mutually similar but not bisimilar initial states
+        A = LTS(
+            [0, 1, 2, 3],
+            [0],
+            ['a'],
+            [(0, 'a', 1), (0, 'a', 2), (2, 'a', 3)]
+        )
+        B = LTS([10, 11, 12], [10], ['a'], [(10, 'a', 11), (11, 'a', 12)])
+
+        full = set(product(A.S, B.S))
+        partial = full - { (3, 10) }
+
+        for R0 in (full, partial):
+            self.assertEqual(
+                maximumBisimulation(A, B, R0),
+                bisimulation(A, B, R0),
+                "maximumBisimulation: forth and back"
+            )
+
+        self.assertNotIn((10, 0), maximumBisimulation(A, B, full))
+        self.assertEqual(
+            maximumBisimulation(A, B, full),
+            maximumBisimulation(A, B, partial),
+            "maximumBisimulation: independent of the shape of R0"
+        )
+
+    ############################################################################
+    # branching bisimulation
+    ############################################################################
+    def test_branching_bisimulation (self):
+        L = LTS (
+            S = [1, 2, 3, 4, 5],
+            I = [1],
+            Σ = ['a', 'b', 'τ'],
+            T = [
+                    (1, 'τ', 2),
+                    (1, 'a', 3),
+                    (2, 'a', 3),
+                    (3, 'τ', 4), # inert
+                    (4, 'τ', 4), # divergence
+                    (2, 'τ', 5),
+                    (5, 'b', 5)
+                ]
+        )
+
+        Q = branchingBisimulation(L, ['τ'])
+
+        self.assertEqual(Q.S, [(1, 2), (3, 4), (5,)], "states")
+        self.assertEqual(Q.I, [(1, 2)], "initial states")
+        self.assertEqual(
+            Q.T,
+            [
+                ((1, 2), 'a', (3, 4)),
+                ((1, 2), 'τ', (5,)),
+                ((5,), 'b', (5,))
+            ],
+            "transitions"
+        )
+
+        # divergence sensitive
+        Q = branchingBisimulation(L, ['τ'], divergence=True)
+
+        self.assertEqual(Q.S, [(1, 2), (3, 4), (5,)], "states")
+        self.assertEqual(
+            Q.T,
+            [
+                ((1, 2), 'a', (3, 4)),
+                ((1, 2), 'τ', (5,)),
+                ((3, 4), 'τ', (3, 4)),
+                ((5,), 'b', (5,))
+            ],
+            "transitions"
+        )
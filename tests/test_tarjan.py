@@ -91,3 +91,17 @@ class TestTarjan (unittest.TestCase):
             tarjan(states, edges),
             [['A', 'B', 'D', 'E', 'H', 'I'], ['C', 'F', 'G', 'J'], ['K']]
         )
+
+    # long chain exceeding python's recursion limit
+    #
+    # SCC
+    # * [0, 1, ..., 9999]
+    # * [10000]
+    def test_chain (self):
+        states = list(range(10001))
+        edges = [ (i, i + 1) for i in range(10000) ] + [ (9999, 0) ]
+
+        self.assertEqual(
+            tarjan(states, edges),
+            [list(range(10000)), [10000]]
+        )
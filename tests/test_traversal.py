@@ -0,0 +1,136 @@
+import unittest
+
+from collections import deque
+from tempfile import TemporaryDirectory
+
+from libmc import bfs, dfs, externalBfs, parallelBfs
+from libmc.traversal import Bitstate, ExactSet, HashCompaction, PriorityQueue, Queue, Stack, visitedSet
+
+# binary tree: n -> 2n, 2n + 1 (top level functions are picklable)
+def tree (n):
+    return [ 2 * n, 2 * n + 1 ] if n < 8 else []
+
+def ring (n):
+    return [ (n + 1) % 5, 0 ]
+
+class TestTraversal (unittest.TestCase):
+
+    def test_bfs_frontiers (self):
+        expected = list(range(1, 16))
+
+        for queue in [ [1], deque([1]), Queue([1]) ]:
+            visited = []
+            bfs(queue, tree, quit=lambda n: visited.append(n))
+            self.assertEqual(visited, expected, "bfs: " + type(queue).__name__)
+            self.assertEqual(len(queue), 0, "bfs: empty " + type(queue).__name__)
+
+    def test_bfs_list_enqueue (self):
+        # objects appended to a list queue by a custom enqueue function
+        queue = [1]
+        visited = []
+        bfs(
+            queue,
+            tree,
+            enqueue=queue.append,
+            quit=lambda n: visited.append(n) or n == 4
+        )
+        self.assertEqual(visited, [1, 2, 3, 4], "bfs: quit")
+        self.assertEqual(queue, [5, 6, 7, 8, 9], "bfs: remaining queue")
+
+    def test_dfs_frontiers (self):
+        expected = [1, 3, 7, 15, 14, 6, 13, 12, 2, 5, 11, 10, 4, 9, 8]
+
+        for stack in [ [1], deque([1]), Stack([1]) ]:
+            visited = []
+            dfs(stack, tree, quit=lambda n: visited.append(n))
+            self.assertEqual(visited, expected, "dfs: " + type(stack).__name__)
+
+    def test_bounded_stack (self):
+        depth = lambda n: n.bit_length() - 1
+
+        stack = Stack([1], limit=2, depth=depth)
+        visited = []
+        dfs(stack, tree, quit=lambda n: visited.append(n))
+        self.assertEqual(sorted(visited), list(range(1, 8)), "Stack: limit")
+        self.assertTrue(stack.cutoff, "Stack: cutoff")
+
+        stack = Stack([1], limit=3, depth=depth)
+        dfs(stack, tree)
+        self.assertFalse(stack.cutoff, "Stack: no cutoff")
+
+        with self.assertRaises(ValueError):
+            Stack([1], limit=2)
+
+    def test_priority_queue (self):
+        # best-first search (smallest distance to 11)
+        queue = PriorityQueue(lambda n: abs(11 - n), [1])
+        visited = []
+        bfs(queue, tree, quit=lambda n: visited.append(n) or n == 11)
+        self.assertEqual(visited, [1, 3, 7, 14, 15, 6, 12, 13, 2, 5, 11], "PriorityQueue")
+
+    def test_parallel_bfs (self):
+        visited, levels = parallelBfs([1], tree, workers=3)
+        self.assertEqual(visited, set(range(1, 16)), "parallelBfs: visited")
+        self.assertEqual(levels, [1, 2, 4, 8], "parallelBfs: levels")
+
+        # cycles and duplicate successors
+        visited, levels = parallelBfs([0, 0], ring, workers=2)
+        self.assertEqual(visited, set(range(5)), "parallelBfs: cycle visited")
+        self.assertEqual(levels, [1, 1, 1, 1, 1], "parallelBfs: cycle levels")
+
+        with self.assertRaises(ValueError):
+            parallelBfs([1], tree, workers=0)
+
+    def test_visited_sets (self):
+        for visited in [ ExactSet(), HashCompaction(capacity=4), Bitstate(bits=1 << 16) ]:
+            name = type(visited).__name__
+            bfs([1], tree, visited=visited)
+            self.assertEqual(len(visited), 15, name + ": size")
+            self.assertTrue(all(n in visited for n in range(1, 16)), name + ": contains")
+            self.assertLess(visited.omissionProbability(), 0.01, name + ": omission probability")
+
+        self.assertEqual(ExactSet().omissionProbability(), 0, "ExactSet: omission probability")
+
+        # saturated bit array
+        visited = Bitstate(range(1000), bits=64, k=2)
+        self.assertEqual(visited.omissionProbability(), 1, "Bitstate: saturated")
+        self.assertTrue(all(n in visited for n in range(1000, 1100)), "Bitstate: false positives")
+
+        self.assertIsInstance(visitedSet("hashcompact"), HashCompaction, "visitedSet")
+        with self.assertRaises(ValueError):
+            visitedSet("unknown")
+        with self.assertRaises(ValueError):
+            HashCompaction(capacity=3)
+
+    def test_external_bfs (self):
+        with TemporaryDirectory() as directory:
+            visited = []
+            levels = externalBfs([1, 1], ring, directory, buffer=1, visit=visited.append)
+            self.assertEqual(levels, [1, 2, 1, 1], "externalBfs: levels")
+            self.assertEqual(sorted(visited), [0, 1, 2, 3, 4], "externalBfs: visited")
+
+        # resume interrupted search
+        def interrupted (n):
+            if n == 4:
+                raise KeyboardInterrupt
+            return tree(n)
+
+        with TemporaryDirectory() as directory:
+            with self.assertRaises(KeyboardInterrupt):
+                externalBfs([1], interrupted, directory, buffer=2)
+
+            visited = []
+            levels = externalBfs([1], tree, directory, buffer=2, visit=visited.append)
+            self.assertEqual(levels, [1, 2, 4, 8], "externalBfs: resumed levels")
+            self.assertEqual(sorted(visited), list(range(8, 16)), "externalBfs: resumed visited")
+            self.assertEqual(externalBfs([1], tree, directory), levels, "externalBfs: finished")
+
+        # equal states built from distinct (but equal) objects
+        def pair (state):
+            a, b = state
+            return [ ("".join([ "x", a[1:] ]), b), (a, "".join(b)) ]
+
+        with TemporaryDirectory() as directory:
+            x = "x" * 8
+            levels = externalBfs([ (x, x) ], pair, directory)
+            self.assertEqual(levels, [1], "externalBfs: equal states")